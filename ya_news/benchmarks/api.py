@@ -0,0 +1,91 @@
+"""
+JSON API против HTML-страниц: сколько строк в секунду отдаёт каждый.
+
+Кэш очищается перед каждым запросом, чтобы сравнивать саму выборку
+и сериализацию, а не чтение готового ответа.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.api
+"""
+from .base import requests_per_second, setup_django, test_database
+
+NEWS_COUNT = 1_000
+COMMENTS_COUNT = 1_000
+
+
+def seed():
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Бенчмарк')
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст новости ' * 20)
+        for index in range(NEWS_COUNT)
+    )
+    news = News.objects.first()
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(COMMENTS_COUNT)
+    )
+    return news
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    with test_database():
+        news = seed()
+        client = Client()
+
+        def rows_per_second(url, rows, **params):
+            def request():
+                cache.clear()
+                response = client.get(url, params)
+                assert response.status_code == 200, response.status_code
+
+            return requests_per_second(request) * rows
+
+        cases = (
+            (
+                'главная, HTML',
+                reverse('news:home'),
+                settings.NEWS_COUNT_ON_HOME_PAGE,
+                {},
+            ),
+            (
+                'новости, API',
+                reverse('news:api_news'),
+                settings.NEWS_API_PAGE_SIZE,
+                {},
+            ),
+            (
+                'новости, API, fields=id,title',
+                reverse('news:api_news'),
+                settings.NEWS_API_PAGE_SIZE,
+                {'fields': 'id,title'},
+            ),
+            (
+                'комментарии, HTML',
+                reverse('news:detail', args=[news.pk]),
+                settings.COMMENTS_COUNT_ON_NEWS_PAGE,
+                {},
+            ),
+            (
+                'комментарии, API',
+                reverse('news:api_comments', args=[news.pk]),
+                settings.COMMENTS_COUNT_ON_NEWS_PAGE,
+                {},
+            ),
+        )
+        print('страница                          строк/с')
+        for name, url, rows, params in cases:
+            print(f'{name:32} {rows_per_second(url, rows, **params):8.0f}')
+
+
+if __name__ == '__main__':
+    main()
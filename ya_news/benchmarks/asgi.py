@@ -0,0 +1,159 @@
+"""
+Страницы чтения под ASGI и WSGI при конкурентных запросах.
+
+Сравниваются три развёртывания: WSGI с пулом потоков, ASGI с обычными
+синхронными представлениями (Django выполняет их в одном общем потоке)
+и ASGI с асинхронными представлениями (ASYNC_VIEWS). Запросы идут
+напрямую в приложение, без сети. БД — временный файл SQLite.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.asgi --concurrency 16 --requests 800
+"""
+import argparse
+import asyncio
+import importlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .base import asgi_get, percentile, setup_django, wsgi_get
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=800)
+    return parser.parse_args()
+
+
+def prepare(path):
+    """Создаёт БД в файле path: новости, комментарии и читателя."""
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test import Client
+
+    from news.models import Comment, News
+
+    connections.databases['default']['NAME'] = str(path)
+    call_command('migrate', verbosity=0)
+    reader = get_user_model().objects.create(username='Читатель')
+    news = [
+        News.objects.create(title=f'Новость {index}', text='Текст')
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE)
+    ]
+    Comment.objects.bulk_create(
+        Comment(news=news[0], author=reader, text=f'Комментарий {index}')
+        for index in range(settings.COMMENTS_COUNT_ON_NEWS_PAGE)
+    )
+    client = Client()
+    client.force_login(reader)
+    session = client.cookies[settings.SESSION_COOKIE_NAME]
+    return news[0], f'{session.key}={session.value}'
+
+
+def use_async_views(enabled):
+    from django.conf import settings
+    from django.urls import clear_url_caches
+
+    import news.urls
+    import yanews.urls
+
+    settings.ASYNC_VIEWS = enabled
+    importlib.reload(news.urls)
+    importlib.reload(yanews.urls)
+    clear_url_caches()
+
+
+def run_wsgi(path, cookies, concurrency, requests):
+    """Задержки запросов к WSGI-приложению из пула потоков."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+
+    application = WSGIHandler()
+
+    def request(_):
+        start = time.perf_counter()
+        wsgi_get(application, path, cookies)
+        return (time.perf_counter() - start) * 1000
+
+    def close(_):
+        connections.close_all()
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = list(pool.map(request, range(requests)))
+        list(pool.map(close, range(concurrency)))
+    return latencies
+
+
+def run_asgi(path, cookies, concurrency, requests):
+    """Задержки запросов к ASGI-приложению из concurrency задач."""
+    from django.core.handlers.asgi import ASGIHandler
+
+    application = ASGIHandler()
+    latencies = []
+
+    async def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await asgi_get(application, path, cookies)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def load():
+        await asyncio.gather(
+            *(client(requests // concurrency) for _ in range(concurrency))
+        )
+
+    asyncio.run(load())
+    return latencies
+
+
+def describe(label, latencies, elapsed):
+    samples = sorted(latencies)
+    return (
+        f'  {label:32} {len(samples) / elapsed:7.1f} запросов/с, '
+        f'p50 {percentile(samples, 0.5):7.1f} мс, '
+        f'p99 {percentile(samples, 0.99):7.1f} мс'
+    )
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    # Разрешает хост testserver.
+    setup_test_environment()
+    deployments = (
+        ('WSGI, пул потоков', False, run_wsgi),
+        ('ASGI, синхронные представления', False, run_asgi),
+        ('ASGI, асинхронные представления', True, run_asgi),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        news, session = prepare(Path(directory, 'db.sqlite3'))
+        pages = (
+            ('главная, аноним', reverse('news:home'), ''),
+            ('новость, аноним', reverse('news:detail', args=[news.pk]), ''),
+            (
+                'новость, читатель',
+                reverse('news:detail', args=[news.pk]),
+                session,
+            ),
+        )
+        for page, path, cookies in pages:
+            print(f'{page}, {args.concurrency} одновременных запросов')
+            for label, async_views, run in deployments:
+                use_async_views(async_views)
+                start = time.perf_counter()
+                latencies = run(
+                    path, cookies, args.concurrency, args.requests
+                )
+                elapsed = time.perf_counter() - start
+                print(describe(label, latencies, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Проверка запрещённых слов: автомат против перебора слов,
+и пропускная способность проверки с нормализацией текста.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.bad_words
+"""
+import random
+import time
+
+from .base import setup_django
+
+WORDS_COUNT = 10_000
+TEXT_SIZE = 50_000
+LONG_TEXT_SIZES = (50_000, 500_000, 2_000_000)
+REPEATS = 5
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def loop_check(words, text):
+    """Прежняя проверка: поиск каждого слова в тексте."""
+    lowered_text = text.lower()
+    return {word for word in words if word in lowered_text}
+
+
+def average_ms(func):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    setup_django()
+    from news.matcher import WordMatcher, normalize
+
+    rng = random.Random(0)
+    words = [random_word(rng, rng.randint(6, 12)) for _ in range(WORDS_COUNT)]
+    text = ' '.join(
+        random_word(rng, rng.randint(2, 9)) for _ in range(TEXT_SIZE // 6)
+    )[:TEXT_SIZE]
+
+    start = time.perf_counter()
+    matcher = WordMatcher(words)
+    build_ms = (time.perf_counter() - start) * 1000
+    assert matcher.find(text) == loop_check(words, text)
+
+    print(f'слов: {WORDS_COUNT}, размер комментария: {len(text)} символов')
+    print(f'построение автомата:  {build_ms:8.1f} мс (один раз)')
+    loop_ms = average_ms(lambda: loop_check(words, text))
+    matcher_ms = average_ms(lambda: matcher.find(text))
+    print(f'перебор слов:         {loop_ms:8.1f} мс')
+    print(f'автомат:              {matcher_ms:8.1f} мс')
+
+    normalized = WordMatcher(words, normalizer=normalize)
+    print('с нормализацией текста:')
+    for size in LONG_TEXT_SIZES:
+        long_text = (text * (size // len(text) + 1))[:size]
+        elapsed_ms = average_ms(lambda: normalized.find(long_text))
+        speed = size / elapsed_ms * 1000
+        print(f'{size:10d} символов: {speed:12,.0f} символов/с')
+
+
+if __name__ == '__main__':
+    main()
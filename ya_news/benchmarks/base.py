@@ -0,0 +1,164 @@
+"""Общие средства для бенчмарков YaNews."""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Временная БД, как у тестов: рабочие данные не затрагиваются."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def requests_per_second(func, duration=2.0):
+    """Сколько раз в секунду удаётся вызвать func."""
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def percentile(samples, fraction):
+    """Перцентиль по отсортированной выборке, без интерполяции."""
+    index = min(len(samples) - 1, int(len(samples) * fraction))
+    return samples[index]
+
+
+def measure(func, requests):
+    """Задержки в перцентилях (мс) и пропускная способность (запросов/с)."""
+    samples = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        request_start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - request_start) * 1000)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        'p50_ms': round(percentile(samples, 0.5), 3),
+        'p90_ms': round(percentile(samples, 0.9), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'rps': round(requests / elapsed, 1),
+    }
+
+
+def client_get(client, path):
+    """GET-запрос тестовым клиентом с чтением всего ответа."""
+    response = client.get(path)
+    # Потоковый ответ клиент не читает, а его тело и есть вся работа.
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response.status_code
+
+
+def wsgi_get(application, path, cookies=''):
+    """GET-запрос напрямую к WSGI-приложению, минуя тестовый клиент."""
+    from wsgiref.util import setup_testing_defaults
+
+    path, _, query = path.partition('?')
+    environ = {
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_HOST': 'testserver',
+        'HTTP_COOKIE': cookies,
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return statuses[0]
+
+
+async def asgi_get(application, path, cookies=''):
+    """GET-запрос к ASGI-приложению в том же процессе, без сервера."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [(b'host', b'testserver'), (b'cookie', cookies.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]['status']
+
+
+def save_results(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {'meta': meta, 'results': results},
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def compare(results, baseline_path, threshold):
+    """
+    Сравнивает результаты с сохранённым прогоном.
+
+    Регрессией считается рост p50 больше, чем на threshold (доля).
+    Возвращает список регрессий.
+    """
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)['results']
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = current['p50_ms'] / previous['p50_ms'] - 1
+        marker = ''
+        if change > threshold:
+            regressions.append(name)
+            marker = '  РЕГРЕССИЯ'
+        print(
+            f'{name:40} {previous["p50_ms"]:9.2f} -> '
+            f'{current["p50_ms"]:9.2f} мс ({change:+.0%}){marker}'
+        )
+    return regressions
@@ -0,0 +1,74 @@
+"""
+Страницы комментариев длинной ветки: курсор против OFFSET.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.comment_pages
+"""
+import time
+
+from .base import setup_django, test_database
+
+COMMENTS_COUNT = 100_000
+BATCH_SIZE = 5_000
+PAGES = (1, 10, 100, 1_000, 1_999)
+REPEATS = 20
+
+
+def seed():
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Бенчмарк')
+    news = News.objects.create(title='Горячая новость', text='Текст')
+    Comment.objects.bulk_create(
+        (
+            Comment(news=news, author=author, text=f'Комментарий {index}')
+            for index in range(COMMENTS_COUNT)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return news
+
+
+def average_ms(func):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+
+    from news.pagination import encode_cursor
+
+    with test_database():
+        news = seed()
+        client = Client()
+        url = reverse('news:detail', args=[news.pk])
+        page_size = settings.COMMENTS_COUNT_ON_NEWS_PAGE
+        thread = news.comment_set.order_by('created', 'pk')
+        print(f'комментариев: {COMMENTS_COUNT}, на странице: {page_size}')
+        print('страница   курсор, мс   OFFSET (только запрос), мс')
+        for page in PAGES:
+            offset = (page - 1) * page_size
+            cursor = (
+                encode_cursor(thread[offset - 1]) if offset else ''
+            )
+            keyset = average_ms(lambda: client.get(url, {'after': cursor}))
+            plain = average_ms(
+                lambda: list(
+                    thread.select_related('author')[
+                        offset: offset + page_size
+                    ]
+                )
+            )
+            print(f'{page:8d}   {keyset:10.2f}   {plain:10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Выгрузка ветки комментариев: поток против списка в памяти.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.export_comments
+"""
+import time
+import tracemalloc
+
+from .base import setup_django, test_database
+
+THREAD_SIZES = (10_000, 100_000, 1_000_000)
+BATCH_SIZE = 5_000
+
+
+def seed(count):
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author, _ = get_user_model().objects.get_or_create(username='Бенчмарк')
+    news = News.objects.create(title=f'Ветка {count}', text='Текст')
+    for start in range(0, count, BATCH_SIZE):
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text=f'Комментарий {index}')
+            for index in range(start, min(start + BATCH_SIZE, count))
+        )
+    return news.pk
+
+
+def measure(export):
+    """Время и пиковая память (МБ) на выгрузку."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    setup_django()
+    from news.export import COMMENT_HEADER, comment_rows, export_lines
+    from news.models import Comment
+
+    def streamed(news_id):
+        for _ in export_lines('csv', COMMENT_HEADER, comment_rows(news_id)):
+            pass
+
+    def materialized(news_id):
+        comments = list(
+            Comment.objects.filter(news_id=news_id)
+            .select_related('author')
+            .order_by('created', 'pk')
+        )
+        rows = [
+            (c.pk, c.author.username, c.created, c.text) for c in comments
+        ]
+        for _ in export_lines('csv', COMMENT_HEADER, rows):
+            pass
+
+    with test_database():
+        print('строк        поток: с  МБ     список: с  МБ')
+        for count in THREAD_SIZES:
+            news_id = seed(count)
+            stream_time, stream_peak = measure(lambda: streamed(news_id))
+            list_time, list_peak = measure(lambda: materialized(news_id))
+            print(
+                f'{count:9d}   {stream_time:7.1f} {stream_peak:6.1f}'
+                f'   {list_time:7.1f} {list_peak:6.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Главная страница: холодный кеш против прогретого.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.home_cache
+"""
+from .base import requests_per_second, setup_django, test_database
+
+NEWS_COUNT = 100
+COMMENTS_PER_NEWS = 50
+
+
+def seed():
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Бенчмарк')
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Просто текст.')
+        for index in range(NEWS_COUNT)
+    )
+    Comment.objects.bulk_create(
+        Comment(news_id=pk, author=author, text='Текст комментария')
+        for pk in News.objects.values_list('pk', flat=True)
+        for _ in range(COMMENTS_PER_NEWS)
+    )
+
+
+def main():
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    with test_database():
+        seed()
+        client = Client()
+        url = reverse('news:home')
+
+        def cold():
+            cache.clear()
+            client.get(url)
+
+        def warm():
+            client.get(url)
+
+        cold_rps = requests_per_second(cold)
+        warm()
+        warm_rps = requests_per_second(warm)
+    print(f'холодный кеш:   {cold_rps:8.1f} запросов/с')
+    print(f'прогретый кеш:  {warm_rps:8.1f} запросов/с')
+    print(f'ускорение:      {warm_rps / cold_rps:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Поток комментариев: много одновременных подписчиков в одном процессе.
+
+Открывает --subscribers потоков news:live к ASGI-приложению, затем
+сохраняет --comments комментариев и замеряет, за сколько событие
+доходит до всех подписчиков, сколько памяти стоит подписчик и сколько
+потоков при этом работает. БД — временный файл SQLite.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.live_comments --subscribers 5000
+"""
+import argparse
+import asyncio
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from .base import percentile, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--comments', type=int, default=20)
+    return parser.parse_args()
+
+
+class Subscriber:
+    """Клиент, который только считает полученные события."""
+
+    def __init__(self, application, path, on_event):
+        self.application = application
+        self.scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+        }
+        self.on_event = on_event
+        self.connected = asyncio.Event()
+        self.disconnected = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        body = message.get('body', b'')
+        if body.startswith(b': connected'):
+            self.connected.set()
+        elif body.startswith(b'id: '):
+            self.on_event()
+
+    def start(self):
+        return asyncio.ensure_future(
+            self.application(self.scope, self.receive, self.send)
+        )
+
+
+async def run(application, path, news, author, args):
+    from news.models import Comment
+    from yanews.offload import run_sync
+
+    received = 0
+    delivered = asyncio.Event()
+
+    def on_event():
+        nonlocal received
+        received += 1
+        if received == args.subscribers:
+            delivered.set()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    subscribers = [
+        Subscriber(application, path, on_event)
+        for _ in range(args.subscribers)
+    ]
+    tasks = [subscriber.start() for subscriber in subscribers]
+    await asyncio.gather(
+        *(subscriber.connected.wait() for subscriber in subscribers)
+    )
+    # Время подключения завышено: его замеряет работающий tracemalloc.
+    connect_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    threads = threading.active_count()
+
+    latencies = []
+    for index in range(args.comments):
+        received = 0
+        delivered.clear()
+        start = time.perf_counter()
+        await run_sync(
+            Comment.objects.create,
+            news=news,
+            author=author,
+            text=f'Комментарий {index}',
+        )
+        await delivered.wait()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    for subscriber in subscribers:
+        subscriber.disconnected.set()
+    await asyncio.gather(*tasks)
+    return connect_time, memory, threads, sorted(latencies)
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.asgi import get_asgi_application
+    from django.core.management import call_command
+    from django.db import connections
+    from django.urls import reverse
+
+    from news.live import with_live_comments
+    from news.models import News
+
+    application = with_live_comments(get_asgi_application())
+    with tempfile.TemporaryDirectory() as directory:
+        connections.databases['default']['NAME'] = str(
+            Path(directory, 'db.sqlite3')
+        )
+        call_command('migrate', verbosity=0)
+        news = News.objects.create(title='Горячая новость', text='Текст')
+        author = get_user_model().objects.create(username='Автор')
+        connections.close_all()
+        connect_time, memory, threads, latencies = asyncio.run(
+            run(
+                application,
+                reverse('news:live', args=[news.pk]),
+                news,
+                author,
+                args,
+            )
+        )
+    print(
+        f'Подписчиков: {args.subscribers}, подключение '
+        f'{connect_time:.2f} с, память {memory / args.subscribers / 1024:.1f}'
+        f' КиБ на подписчика, потоков в процессе: {threads}'
+    )
+    print(
+        'От сохранения до доставки всем: '
+        f'p50 {percentile(latencies, 0.5):.1f} мс, '
+        f'p99 {percentile(latencies, 0.99):.1f} мс'
+    )
+
+
+if __name__ == '__main__':
+    main()
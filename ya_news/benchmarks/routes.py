@@ -0,0 +1,171 @@
+"""
+Задержки и пропускная способность всех маршрутов news/urls.py.
+
+Каждый маршрут измеряется через тестовый клиент Django и напрямую
+через WSGI-приложение yanews.wsgi. Результаты сохраняются в JSON,
+с --baseline сравниваются с прошлым прогоном.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.routes --output before.json
+    python -m benchmarks.routes --baseline before.json --threshold 0.2
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from .base import (
+    client_get,
+    compare,
+    measure,
+    save_results,
+    setup_django,
+    test_database,
+    wsgi_get,
+)
+
+BATCH_SIZE = 5_000
+
+# Маршрут: аргументы для reverse и нужен ли вход автора комментария.
+ROUTES = {
+    'home': (lambda data: {}, False),
+    'detail': (lambda data: {'pk': data['news_pk']}, False),
+    'edit': (lambda data: {'pk': data['comment_pk']}, True),
+    'delete': (lambda data: {'pk': data['comment_pk']}, True),
+    'export': (
+        lambda data: {'pk': data['news_pk'], 'file_format': 'csv'},
+        True,
+    ),
+    'api_news': (lambda data: {}, False),
+    'api_comments': (lambda data: {'pk': data['news_pk']}, False),
+}
+
+# Маршруты, которые не измеряются: поток комментариев обслуживает
+# только ASGI-приложение, через WSGI он сразу отвечает 204.
+SKIPPED = {'live'}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--news', type=int, default=1_000)
+    parser.add_argument('--comments', type=int, default=20_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--output', help='Куда сохранить результаты.')
+    parser.add_argument('--baseline', help='Результаты для сравнения.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='Допустимый рост p50, доля (0.2 = 20%%).',
+    )
+    return parser.parse_args()
+
+
+def seed(users, news, comments):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Permission
+    from django.core.management import call_command
+    from django.db.models import Min
+
+    from news.models import Comment, News
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{index}') for index in range(users)
+    )
+    News.objects.bulk_create(
+        (
+            News(title=f'Новость {index}', text='Просто текст. ' * 20)
+            for index in range(news)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    # Половина комментариев достаётся одной горячей новости.
+    hot_news = news_ids[0]
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                news_id=hot_news if index % 2 else news_ids[index % news],
+                author_id=user_ids[index % users],
+                text=f'Комментарий {index}',
+            )
+            for index in range(comments)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    # bulk_create не обновляет счётчики, пересчитываем их.
+    call_command('recount_comments', verbosity=0)
+    comment_pk = Comment.objects.aggregate(pk=Min('pk'))['pk']
+    author = Comment.objects.get(pk=comment_pk).author
+    # Выгрузку комментариев видят только пользователи с правом на неё.
+    author.user_permissions.add(
+        Permission.objects.get(
+            content_type__app_label='news', codename='view_comment'
+        )
+    )
+    return {
+        'news_pk': hot_news,
+        'comment_pk': comment_pk,
+        'author': author,
+    }
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.test import Client
+    from django.urls import reverse
+
+    from news import urls
+    from yanews.wsgi import application
+
+    names = {pattern.name for pattern in urls.urlpatterns}
+    missing = names - set(ROUTES) - SKIPPED
+    if missing:
+        sys.exit(f'Нет настроек для маршрутов: {missing}')
+
+    with test_database():
+        data = seed(args.users, args.news, args.comments)
+        anonymous = Client()
+        author = Client()
+        author.force_login(data['author'])
+        author_cookies = '; '.join(
+            f'{name}={morsel.value}' for name, morsel in author.cookies.items()
+        )
+        results = {}
+        for name, (kwargs, login) in ROUTES.items():
+            url = reverse(f'news:{name}', kwargs=kwargs(data))
+            client = author if login else anonymous
+            cookies = author_cookies if login else ''
+            results[f'client:news:{name}'] = measure(
+                lambda: client_get(client, url), args.requests
+            )
+            results[f'wsgi:news:{name}'] = measure(
+                lambda: wsgi_get(application, url, cookies), args.requests
+            )
+
+    for name, result in results.items():
+        print(
+            f'{name:24} p50 {result["p50_ms"]:8.2f}  '
+            f'p90 {result["p90_ms"]:8.2f}  p99 {result["p99_ms"]:8.2f} мс  '
+            f'{result["rps"]:8.1f} запросов/с'
+        )
+    if args.output:
+        meta = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'users': args.users,
+            'news': args.news,
+            'comments': args.comments,
+            'requests': args.requests,
+        }
+        save_results(args.output, results, meta)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            sys.exit(f'Регрессии: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Конкурентная работа с SQLite: журнал отката против профиля PRAGMA.
+
+Потоки-писатели отправляют комментарии, потоки-читатели открывают
+главную страницу. Режим журнала хранится в самом файле БД, поэтому
+каждый профиль получает свой временный файл.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 4
+"""
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .base import percentile, setup_django
+
+# Так соединения работали до SQLITE_PRAGMAS: журнал отката, fsync на
+# каждую транзакцию и стандартное ожидание блокировки модуля sqlite3.
+ROLLBACK_JOURNAL = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    return parser.parse_args()
+
+
+def prepare(path, writers):
+    """Создаёт БД в файле path, новость и пользователей-писателей."""
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connections
+
+    from news.models import News
+
+    connections.close_all()
+    connections.databases['default']['NAME'] = str(path)
+    call_command('migrate', verbosity=0)
+    news = News.objects.create(title='Горячая новость', text='Текст')
+    users = [
+        get_user_model().objects.create(username=f'Писатель {index}')
+        for index in range(writers)
+    ]
+    return news, users
+
+
+def worker(request, stop, stats, lock):
+    """
+    Повторяет request до сигнала stop, считая успехи и ошибки.
+
+    Ошибкой считается ответ 500: под нагрузкой это «database is locked».
+    """
+    from django.db import connections
+
+    latencies = []
+    errors = 0
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            if request().status_code >= 500:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+    with lock:
+        stats['latencies'].extend(latencies)
+        stats['errors'] += errors
+
+
+def run(news, users, readers, duration):
+    from django.test import Client
+    from django.urls import reverse
+
+    detail_url = reverse('news:detail', args=[news.pk])
+    home_url = reverse('news:home')
+    stop = threading.Event()
+    lock = threading.Lock()
+    writes = {'latencies': [], 'errors': 0}
+    reads = {'latencies': [], 'errors': 0}
+    threads = []
+    for user in users:
+        # Исключения из чужих потоков тестовый клиент принял бы за свои,
+        # поэтому ошибки определяем по коду ответа.
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+        text = f'Комментарий от {user.username}'
+        threads.append(
+            threading.Thread(
+                target=worker,
+                args=(
+                    lambda client=client, text=text: client.post(
+                        detail_url, {'text': text}
+                    ),
+                    stop,
+                    writes,
+                    lock,
+                ),
+            )
+        )
+    for _ in range(readers):
+        client = Client(raise_request_exception=False)
+        threads.append(
+            threading.Thread(
+                target=worker,
+                args=(lambda client=client: client.get(home_url), stop,
+                      reads, lock),
+            )
+        )
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return writes, reads
+
+
+def describe(label, stats, duration):
+    done = len(stats['latencies'])
+    total = done + stats['errors']
+    samples = sorted(stats['latencies']) or [0.0]
+    return (
+        f'{label}: {done / duration:7.1f}/с, '
+        f'p99 {percentile(samples, 0.99):7.1f} мс, '
+        f'ошибок {stats["errors"]} '
+        f'({stats["errors"] / max(total, 1):.1%})'
+    )
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+    from django.test.utils import setup_test_environment
+
+    # Разрешает хост testserver тестового клиента.
+    setup_test_environment()
+    # Трейсбеки ошибок 500 только мешают читать результат.
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+    profiles = {
+        'журнал отката': ROLLBACK_JOURNAL,
+        'SQLITE_PRAGMAS': settings.SQLITE_PRAGMAS,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (label, pragmas) in enumerate(profiles.items()):
+            with override_settings(
+                SQLITE_PRAGMAS=pragmas, NEWS_HOME_CACHE_ENABLED=False
+            ):
+                news, users = prepare(
+                    Path(directory, f'{index}.sqlite3'), args.writers
+                )
+                writes, reads = run(
+                    news, users, args.readers, args.duration
+                )
+            print(label)
+            print('  ' + describe('запись', writes, args.duration))
+            print('  ' + describe('чтение', reads, args.duration))
+
+
+if __name__ == '__main__':
+    main()
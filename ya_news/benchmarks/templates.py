@@ -0,0 +1,78 @@
+"""
+Накладные расходы на шаблоны: обычный загрузчик против кеширующего.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.templates
+"""
+import os
+
+from .base import measure, setup_django, test_database
+
+REQUESTS = 300
+
+
+def seed():
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username='Бенчмарк')
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Просто текст.')
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE)
+    )
+    news = News.objects.first()
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(settings.COMMENTS_COUNT_ON_NEWS_PAGE)
+    )
+    return news
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    # Нужен только список загрузчиков шаблонов из профиля prod.
+    os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark')
+    from yanews.settings import prod as prod_settings
+    from yanews.templating import warm_templates
+
+    profiles = {
+        'без кеша шаблонов': settings.TEMPLATES,
+        'кеширующий загрузчик': prod_settings.TEMPLATES,
+    }
+    with test_database():
+        news = seed()
+        urls = {
+            'главная': reverse('news:home'),
+            'новость': reverse('news:detail', args=[news.pk]),
+        }
+        results = {}
+        for profile, templates in profiles.items():
+            # Кеш страниц выключен, чтобы каждый запрос рендерил шаблоны.
+            with override_settings(
+                TEMPLATES=templates,
+                NEWS_HOME_CACHE_ENABLED=False,
+                NEWS_THREAD_CACHE_TIMEOUT=0,
+            ):
+                warm_templates()
+                client = Client()
+                for page, url in urls.items():
+                    results[profile, page] = measure(
+                        lambda: client.get(url), REQUESTS
+                    )
+        for page in urls:
+            plain = results['без кеша шаблонов', page]['p50_ms']
+            cached = results['кеширующий загрузчик', page]['p50_ms']
+            print(
+                f'{page}: p50 {plain:.2f} -> {cached:.2f} мс, '
+                f'на шаблоны уходило {plain - cached:.2f} мс'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Страница новости: ветка комментариев из кеша против отрисовки.
+
+Запуск из каталога ya_news:
+    python -m benchmarks.thread_cache
+"""
+from .base import requests_per_second, setup_django, test_database
+
+
+def seed():
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    users = get_user_model().objects
+    author = users.create(username='Бенчмарк')
+    reader = users.create(username='Читатель')
+    news = News.objects.create(title='Горячая новость', text='Текст')
+    Comment.objects.bulk_create(
+        Comment(
+            news=news,
+            author=author if index % 5 else reader,
+            text=f'Длинный комментарий {index}\nс переносом строки. ' * 5,
+        )
+        for index in range(settings.COMMENTS_COUNT_ON_NEWS_PAGE)
+    )
+    return news, reader
+
+
+def main():
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    with test_database():
+        news, reader = seed()
+        url = reverse('news:detail', args=[news.pk])
+        anonymous = Client()
+        authorized = Client()
+        authorized.force_login(reader)
+        for label, client in (
+            ('аноним', anonymous),
+            ('автор части комментариев', authorized),
+        ):
+
+            def cold():
+                cache.clear()
+                client.get(url)
+
+            def warm():
+                client.get(url)
+
+            cold_rps = requests_per_second(cold)
+            warm()
+            warm_rps = requests_per_second(warm)
+            print(
+                f'{label}: отрисовка {cold_rps:.1f} запросов/с, '
+                f'из кеша {warm_rps:.1f} запросов/с '
+                f'({warm_rps / cold_rps:.1f}x)'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,37 @@
 import pytest
+from asgiref.sync import async_to_sync
+from contextlib import contextmanager
 from datetime import date
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
 from news.models import News, Comment
+from yanews.middleware import instrument
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш живёт дольше тестовой БД, очищаем его перед каждым тестом."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    """Превышение бюджета запросов к БД роняет тест."""
+    settings.QUERY_BUDGET_STRICT = True
+
+
+@pytest.fixture(autouse=True)
+def count_queries():
+    """
+    Подключает счётчик запросов к уже открытым соединениям.
+
+    Соединение теста открывается раньше, чем загружаются middleware,
+    а синхронное представление под ASGI работает именно с ним.
+    """
+    for alias in connections:
+        instrument(connections[alias])
 
 
 @pytest.fixture
@@ -46,3 +77,86 @@ def comment(author, news):
 @pytest.fixture
 def pk_for_kwargs(comment):
     return {'pk': comment.pk}
+
+
+@pytest.fixture
+def assert_no_full_scans():
+    """
+    Проверяет планы SELECT-запросов, выполненных внутри блока.
+
+    Полный просмотр таблицы или сортировка во временном B-дереве
+    означают, что запросу не хватает индекса.
+    """
+    if connection.vendor != 'sqlite':
+        pytest.skip('Планы запросов проверяются только для SQLite.')
+
+    @contextmanager
+    def check():
+        with CaptureQueriesContext(connection) as context:
+            yield
+        problems = []
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for *_, detail in cursor.fetchall():
+                    if 'USE TEMP B-TREE' in detail or (
+                        detail.startswith('SCAN ') and 'INDEX' not in detail
+                    ):
+                        problems.append(f'{detail}: {sql}')
+        assert not problems, '\n'.join(problems)
+
+    return check
+
+
+@pytest.fixture
+def asgi_get():
+    """
+    GET-запрос к ASGI-приложению, как его вызывает сервер.
+
+    В отличие от AsyncClient, тело ответа читается самим обработчиком
+    ASGI, в цикле событий. Возвращает статус, заголовки и тело.
+    """
+    application = get_asgi_application()
+
+    def get(path, client=None, query=''):
+        cookies = '; '.join(
+            f'{name}={morsel.value}'
+            for name, morsel in (client.cookies.items() if client else ())
+        )
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'query_string': query.encode(),
+            'headers': [
+                (b'host', b'testserver'),
+                (b'cookie', cookies.encode()),
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        async def call():
+            await application(scope, receive, send)
+
+        async_to_sync(call)()
+        start, *body = messages
+        headers = {
+            name.decode().lower(): value.decode()
+            for name, value in start['headers']
+        }
+        content = b''.join(message.get('body', b'') for message in body)
+        return start['status'], headers, content
+
+    return get
@@ -6,7 +6,10 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    profile = 'test' if sys.argv[1:2] == ['test'] else 'dev'
+    os.environ.setdefault(
+        'DJANGO_SETTINGS_MODULE', f'yanews.settings.{profile}'
+    )
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
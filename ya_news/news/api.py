@@ -0,0 +1,156 @@
+"""
+JSON API для чтения новостей и комментариев.
+
+Строки читаются через values() и сериализуются без создания моделей.
+Параметр fields выбирает поля ответа через запятую, after — курсор
+следующей страницы, готовая ссылка на неё приходит в поле next.
+"""
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import JsonResponse
+from django.views import generic
+from django.views.decorators.http import condition
+
+from .cache import comments_api_etag, news_api_etag, news_modified
+from .models import Comment, News
+from .pagination import (
+    comments_page,
+    encode_news_position,
+    encode_position,
+    news_page,
+)
+
+
+class ApiError(Exception):
+    """Ошибка запроса, о которой клиент узнаёт из JSON-ответа."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def json_response(data, status=HTTPStatus.OK):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+class BaseApiView(generic.View):
+    """
+    Основа представлений API: страница строк в JSON.
+
+    fields сопоставляет имена полей в ответе полям для values(),
+    key_fields — поля, нужные для курсора, даже если клиент их не просил.
+    Сам по себе не используется: наследник определяет get_queryset()
+    и get_page(queryset, cursor), возвращающий строки страницы и курсор
+    следующей страницы (или None).
+    """
+
+    fields = {}
+    key_fields = ()
+    etag_func = None
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(etag_func=self.etag_func)(super().dispatch)
+        return view(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            names = self.selected_fields()
+            lookups = [self.fields[name] for name in names]
+            queryset = self.get_queryset().values(
+                *dict.fromkeys([*lookups, *self.key_fields])
+            )
+        except ApiError as error:
+            return json_response({'error': str(error)}, error.status)
+        rows, next_cursor = self.get_page(queryset, request.GET.get('after'))
+        results = [
+            {name: row[lookup] for name, lookup in zip(names, lookups)}
+            for row in rows
+        ]
+        return json_response(
+            {'results': results, 'next': self.next_url(next_cursor)}
+        )
+
+    def selected_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        names = list(
+            dict.fromkeys(filter(None, map(str.strip, requested.split(','))))
+        )
+        if not names:
+            raise ApiError(
+                f'Не выбрано ни одного поля. '
+                f'Доступны: {", ".join(self.fields)}.'
+            )
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(unknown)}. '
+                f'Доступны: {", ".join(self.fields)}.'
+            )
+        return names
+
+    def next_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['after'] = cursor
+        return f'{self.request.path}?{query.urlencode()}'
+
+
+class NewsListApi(BaseApiView):
+    """Новости от свежих к старым, по NEWS_API_PAGE_SIZE на странице."""
+
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'date': 'date',
+        'comment_count': 'comment_count',
+    }
+    key_fields = ('id', 'date')
+    etag_func = staticmethod(news_api_etag)
+
+    def get_queryset(self):
+        # ETag берётся из поколения, поэтому, как и главная страница,
+        # список читается из основной БД, а не с отстающей реплики.
+        return News.objects.using(DEFAULT_DB_ALIAS)
+
+    def get_page(self, queryset, cursor):
+        return news_page(
+            queryset,
+            cursor,
+            settings.NEWS_API_PAGE_SIZE,
+            lambda row: encode_news_position(row['date'], row['id']),
+        )
+
+
+class CommentsApi(BaseApiView):
+    """Комментарии новости по порядку, страницами как на её странице."""
+
+    fields = {
+        'id': 'id',
+        'author': 'author__username',
+        'created': 'created',
+        'text': 'text',
+    }
+    key_fields = ('id', 'created')
+    etag_func = staticmethod(comments_api_etag)
+
+    def get_queryset(self):
+        # Время изменения новости уже прочитано для ETag.
+        if news_modified(self.request, self.kwargs['pk']) is None:
+            raise ApiError('Новость не найдена.', HTTPStatus.NOT_FOUND)
+        return Comment.objects.filter(news_id=self.kwargs['pk'])
+
+    def get_page(self, queryset, cursor):
+        return comments_page(
+            queryset,
+            cursor,
+            settings.COMMENTS_COUNT_ON_NEWS_PAGE,
+            lambda row: encode_position(row['created'], row['id']),
+        )
@@ -0,0 +1,126 @@
+"""Кеширование страниц YaNews."""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import News
+from .pagination import decode_cursor
+
+GENERATION_KEY = 'news:generation'
+
+
+def _initial_generation():
+    # Начальное значение берём из времени: если ключ вытеснен из кеша,
+    # счётчик не вернётся к уже использованному поколению.
+    return time.time_ns()
+
+
+def get_generation():
+    """Текущее поколение данных о новостях и комментариях."""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Сбрасывает все закешированные страницы, зависящие от поколения."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+
+
+def home_page_key():
+    return f'news:home:{get_generation()}'
+
+
+def thread_key(news, cursor):
+    """
+    Ключ страницы комментариев новости.
+
+    В ключ входит время изменения новости, которое обновляется при любой
+    записи комментария, так что устаревшие страницы просто не читаются.
+    """
+    if decode_cursor(cursor) is None:
+        cursor = ''
+    return (
+        f'news:thread:{news.pk}:{news.modified.isoformat()}:'
+        f'{settings.COMMENTS_COUNT_ON_NEWS_PAGE}:{cursor}'
+    )
+
+
+def page_etag(request, *version):
+    """
+    ETag страницы по версии данных, из которых она собрана.
+
+    Авторизованный пользователь видит своё имя, форму комментария
+    с CSRF-токеном и ссылки на свои комментарии, поэтому для него
+    в ETag входят пользователь и CSRF-cookie.
+    """
+    if request.user.is_authenticated:
+        version += (request.user.pk, request.META.get('CSRF_COOKIE'))
+    return hashlib.md5(repr(version).encode()).hexdigest()
+
+
+def home_page_etag(request, *args, **kwargs):
+    """
+    Версия главной страницы.
+
+    Главная меняется вместе с поколением данных, поэтому ETag
+    считается без запросов к БД.
+    """
+    return page_etag(request, 'home', get_generation())
+
+
+def news_modified(request, pk, *args, **kwargs):
+    """Время изменения новости или её комментариев."""
+    if not hasattr(request, '_news_modified'):
+        request._news_modified = (
+            News.objects.filter(pk=pk).values_list('modified', flat=True)
+        ).first()
+    return request._news_modified
+
+
+def news_etag(request, pk, *args, **kwargs):
+    modified = news_modified(request, pk)
+    if modified is None:
+        return None
+    return page_etag(request, pk, modified)
+
+
+def news_last_modified(request, pk, *args, **kwargs):
+    """
+    Last-Modified отдаём только анонимам.
+
+    Для авторизованного пользователя страница зависит не только
+    от времени изменения новости.
+    """
+    if request.user.is_authenticated:
+        return None
+    return news_modified(request, pk)
+
+
+def api_etag(request, *version):
+    """
+    ETag ответа API.
+
+    Ответ API не зависит от пользователя, только от версии данных
+    и параметров запроса.
+    """
+    version += (sorted(request.GET.lists()),)
+    return hashlib.md5(repr(version).encode()).hexdigest()
+
+
+def news_api_etag(request, *args, **kwargs):
+    return api_etag(request, 'api:news', get_generation())
+
+
+def comments_api_etag(request, pk, *args, **kwargs):
+    modified = news_modified(request, pk)
+    if modified is None:
+        return None
+    return api_etag(request, 'api:comments', pk, modified)
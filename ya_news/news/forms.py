@@ -1,6 +1,11 @@
+import os
+from functools import lru_cache
+
+from django.conf import settings
 from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
+from .matcher import WordMatcher, load_words, normalize
 from .models import Comment
 
 BAD_WORDS = (
@@ -11,6 +16,30 @@ BAD_WORDS = (
 WARNING = 'Не ругайтесь!'
 
 
+def get_bad_words_matcher():
+    """
+    Автомат для поиска запрещённых слов.
+
+    Кроме BAD_WORDS использует словарь из файла NEWS_BAD_WORDS_FILE,
+    если он задан в настройках. Текст нормализуется, поэтому слово не
+    спрятать за латинскими буквами, знаками препинания или повторами.
+
+    Автомат строится заново, только если сменилась настройка или файл
+    словаря.
+    """
+    path = settings.NEWS_BAD_WORDS_FILE
+    modified = os.stat(path).st_mtime_ns if path else None
+    return _bad_words_matcher(path, modified)
+
+
+@lru_cache(maxsize=1)
+def _bad_words_matcher(path, modified):
+    words = list(BAD_WORDS)
+    if path:
+        words.extend(load_words(path))
+    return WordMatcher(words, normalizer=normalize)
+
+
 class CommentForm(ModelForm):
     class Meta:
         model = Comment
@@ -19,8 +48,11 @@ class CommentForm(ModelForm):
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        found = get_bad_words_matcher().find(text)
+        if found:
+            raise ValidationError(
+                WARNING,
+                code='bad_words',
+                params={'words': ', '.join(sorted(found))},
+            )
         return text
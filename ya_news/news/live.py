@@ -0,0 +1,285 @@
+"""
+Новые комментарии в реальном времени: поток Server-Sent Events.
+
+Поток обслуживается напрямую ASGI-приложением, без представления Django:
+в Django 3.2 ответ не может читать асинхронный источник, а синхронный
+занимал бы поток на каждого клиента. Здесь клиент — это корутина,
+которая ждёт события из очереди, так что тысячи простаивающих
+соединений стоят лишь памяти.
+
+Рассылка работает в пределах процесса: комментарий, сохранённый в другом
+процессе сервера, подписчики этого процесса не увидят.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http.request import split_domain_port, validate_host
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+
+from yanews.offload import run_sync
+
+from .models import Comment, News
+from .pagination import parse_pk
+from .views import CONTROLS
+
+
+# Служебные события в очереди подписчика: пустой комментарий SSE, чтобы
+# прокси не закрыл тихое соединение, и отключение клиента.
+KEEPALIVE = (None, b': keepalive\n\n')
+DISCONNECTED = (None, None)
+
+
+class Subscription:
+    """
+    Подписка одного клиента на комментарии новости.
+
+    В очередь попадают и комментарии, и служебные события, так что поток
+    клиента просто ждёт следующего элемента очереди.
+    """
+
+    def __init__(self, news_id, loop):
+        self.news_id = news_id
+        self.loop = loop
+        self.queue = asyncio.Queue(settings.NEWS_LIVE_QUEUE_SIZE)
+        # Клиент не успевал читать, и события терялись. Поток закрывается,
+        # а при переподключении пропущенное отдаётся по Last-Event-ID.
+        self.overflowed = False
+        self.timer = loop.call_later(
+            settings.NEWS_LIVE_KEEPALIVE, self.keepalive
+        )
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def keepalive(self):
+        self.push(KEEPALIVE)
+        self.timer = self.loop.call_later(
+            settings.NEWS_LIVE_KEEPALIVE, self.keepalive
+        )
+
+    def close(self):
+        self.timer.cancel()
+
+
+class CommentBroker:
+    """
+    Рассылает события подписчикам новости.
+
+    Публикуют из потоков, где сохраняются комментарии, а подписчики
+    живут в цикле событий, поэтому события передаются в цикл через
+    call_soon_threadsafe, один вызов на цикл, а не на подписчика.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, news_id):
+        subscription = Subscription(news_id, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions[news_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.news_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.news_id]
+
+    def has_subscribers(self, news_id):
+        return news_id in self.subscriptions
+
+    def publish(self, news_id, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(news_id, ()))
+        by_loop = defaultdict(list)
+        for subscription in subscriptions:
+            by_loop[subscription.loop].append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(deliver, group, event)
+            except RuntimeError:
+                # Цикл уже закрыт вместе с его клиентами.
+                pass
+
+
+def deliver(subscriptions, event):
+    for subscription in subscriptions:
+        subscription.push(event)
+
+
+broker = CommentBroker()
+
+
+def comment_event(comment):
+    """
+    Событие SSE с отрисованным комментарием.
+
+    Ссылки на редактирование зависят от пользователя, а событие общее
+    для всех, поэтому их метки просто удаляются.
+    """
+    html = CONTROLS.sub(
+        '', render_to_string('news/comments.html', {'comments': [comment]})
+    )
+    data = ''.join(f'data: {line}\n' for line in html.strip().splitlines())
+    return comment.pk, f'id: {comment.pk}\nevent: comment\n{data}\n'.encode()
+
+
+def missed_events(news_id, last_id):
+    """
+    События для комментариев после last_id или None, если новости нет.
+
+    Браузер, переподключаясь, присылает id последнего события в
+    Last-Event-ID, и пропущенные комментарии берутся из БД.
+    """
+    if not News.objects.filter(pk=news_id).exists():
+        return None
+    if last_id is None:
+        return []
+    comments = (
+        Comment.objects.filter(news_id=news_id, pk__gt=last_id)
+        .select_related('author')
+        .order_by('pk')[: settings.COMMENTS_COUNT_ON_NEWS_PAGE]
+    )
+    return [comment_event(comment) for comment in comments]
+
+
+def header(scope, name):
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin1')
+    return None
+
+
+async def stream_comments(scope, receive, send, news_id):
+    """Отдаёт клиенту новые комментарии новости, пока он не отключится."""
+    # Некорректный заголовок — как будто его нет.
+    last_id = parse_pk(header(scope, b'last-event-id'))
+    # Подписываемся до чтения БД, чтобы не пропустить комментарий,
+    # сохранённый между запросом и подпиской.
+    subscription = broker.subscribe(news_id)
+    try:
+        missed = await run_sync(missed_events, news_id, last_id)
+        if missed is None:
+            await not_found(send)
+            return
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    # Не копить события в буфере nginx.
+                    (b'x-accel-buffering', b'no'),
+                ],
+            }
+        )
+        await send(
+            {
+                'type': 'http.response.body',
+                'body': b': connected\n\n',
+                'more_body': True,
+            }
+        )
+        await relay(subscription, missed, last_id, receive, send)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def not_found(send):
+    await send(
+        {
+            'type': 'http.response.start',
+            'status': 404,
+            'headers': [(b'content-type', b'text/plain')],
+        }
+    )
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def relay(subscription, missed, last_id, receive, send):
+    for pk, event in missed:
+        await send_event(send, event)
+        last_id = pk
+    disconnected = asyncio.ensure_future(wait_disconnect(receive))
+    disconnected.add_done_callback(
+        lambda task: task.cancelled() or subscription.push(DISCONNECTED)
+    )
+    try:
+        while not subscription.overflowed:
+            pk, event = await subscription.queue.get()
+            if event is None:
+                return
+            # Комментарий мог уже прийти из БД вместе с пропущенными.
+            if pk is not None and last_id is not None and pk <= last_id:
+                continue
+            await send_event(send, event)
+            last_id = pk or last_id
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+
+
+async def send_event(send, event):
+    await send(
+        {'type': 'http.response.body', 'body': event, 'more_body': True}
+    )
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def allowed_host(scope):
+    """Проверка Host по ALLOWED_HOSTS, как в HttpRequest.get_host()."""
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = ['.localhost', '127.0.0.1', '[::1]']
+    domain, port = split_domain_port(header(scope, b'host') or '')
+    return bool(domain) and validate_host(domain, allowed_hosts)
+
+
+def with_live_comments(application):
+    """
+    ASGI-приложение: поток комментариев по адресу news:live, остальное —
+    application.
+
+    Поток обходит все middleware Django, поэтому Host проверяется здесь
+    же: запрос с чужим Host уходит в application, и Django отвечает 400.
+    Сессия, CSRF и прочие middleware к потоку не применяются, он отдаёт
+    только публичные комментарии.
+    """
+
+    async def router(scope, receive, send):
+        if (
+            scope['type'] == 'http'
+            and scope['path'].endswith('/live/')
+            and allowed_host(scope)
+        ):
+            try:
+                match = resolve(scope['path'])
+            except Resolver404:
+                match = None
+            if match is not None and match.view_name == 'news:live':
+                # <int:pk> пропускает сколь угодно длинные числа.
+                news_id = parse_pk(match.kwargs['pk'])
+                if news_id is None:
+                    await not_found(send)
+                else:
+                    await stream_comments(scope, receive, send, news_id)
+                return
+        await application(scope, receive, send)
+
+    return router
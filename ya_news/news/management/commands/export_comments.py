@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.export import COMMENT_HEADER, FORMATS, comment_rows, export_lines
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Выгружает все комментарии новости в CSV или JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('news_id', type=int)
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        news_id = options['news_id']
+        if not News.objects.filter(pk=news_id).exists():
+            raise CommandError(f'Новость {news_id} не найдена.')
+        lines = export_lines(
+            options['format'], COMMENT_HEADER, comment_rows(news_id)
+        )
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as file:
+            file.writelines(lines)
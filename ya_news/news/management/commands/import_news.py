@@ -0,0 +1,309 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from news.cache import bump_generation
+from news.forms import WARNING, get_bad_words_matcher
+from news.models import Comment, News
+
+User = get_user_model()
+
+NEWS_FIELDS = ('title', 'text', 'date')
+
+
+def read_jsonl(file):
+    """Отдаёт объекты из файла JSON Lines по одному."""
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row
+
+
+def read_csv(file):
+    """Отдаёт строки CSV-файла с заголовком по одной."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+def clean_news(row):
+    """Проверяет строку файла и строит по ней несохранённую новость."""
+    if not isinstance(row, dict):
+        raise ValidationError('Строка не является объектом JSON.')
+    external_id = row.get('id')
+    if external_id in (None, ''):
+        raise ValidationError({'id': 'Не указан идентификатор новости.'})
+    values = {name: row.get(name) for name in NEWS_FIELDS}
+    if values['date'] in (None, ''):
+        # Без даты новость сохранит прежнюю или получит сегодняшнюю.
+        del values['date']
+    values['external_id'] = str(external_id)
+    news = News(date=None)
+    errors = {}
+    for name, value in values.items():
+        try:
+            setattr(news, name, News._meta.get_field(name).clean(value, news))
+        except ValidationError as error:
+            errors[name] = error.messages
+    if errors:
+        raise ValidationError(errors)
+    return news
+
+
+def clean_comment(data, user_ids):
+    """Проверяет комментарий из строки файла."""
+    if not isinstance(data, dict):
+        raise ValidationError('Комментарий не является объектом.')
+    author_id = user_ids.get(data.get('author'))
+    if author_id is None:
+        raise ValidationError(f'Неизвестный автор {data.get("author")!r}.')
+    text = Comment._meta.get_field('text').clean(data.get('text'), None)
+    if get_bad_words_matcher().find(text):
+        raise ValidationError(WARNING)
+    external_id = data.get('id')
+    if external_id in (None, ''):
+        external_id = None
+    else:
+        external_id = Comment._meta.get_field('external_id').clean(
+            str(external_id), None
+        )
+    return Comment(author_id=author_id, text=text, external_id=external_id)
+
+
+def describe(error):
+    """Сводит ошибки валидации в одну строку."""
+    if hasattr(error, 'error_dict'):
+        return '; '.join(
+            f'{field}: {" ".join(messages)}'
+            for field, messages in error.message_dict.items()
+        )
+    return ' '.join(error.messages)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает новости из файла JSON Lines или CSV. Файл читается '
+        'потоково, новости с уже известным id обновляются. В JSON Lines '
+        'у новости может быть список comments из объектов с полями '
+        'author (имя пользователя), text и id; комментарий с id, который '
+        'у новости уже есть, повторно не добавляется, а комментарии без '
+        'id добавляются при каждой загрузке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help='Формат файла; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько строк загружать в одной транзакции.',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=100_000,
+            help='Как часто, в строках, сообщать о ходе загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in READERS:
+            raise CommandError(
+                f'Не удалось определить формат файла {path}, '
+                'укажите --format.'
+            )
+        self.verbosity = options['verbosity']
+        self.stats = dict.fromkeys(
+            ('rows', 'created', 'updated', 'comments', 'errors'), 0
+        )
+        batch_size = options['batch_size']
+        progress_every = options['progress_every']
+        self.started = time.perf_counter()
+        reported = 0
+        with open(path, encoding='utf-8', newline='') as file:
+            rows = READERS[file_format](file)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                self.import_batch(batch)
+                if self.stats['rows'] - reported >= progress_every:
+                    reported = self.stats['rows']
+                    self.report()
+        stats = self.stats
+        if stats['created'] or stats['updated'] or stats['comments']:
+            # Массовые операции не отправляют сигналы, сбрасываем кеш сами.
+            bump_generation()
+        if not reported or self.stats['rows'] != reported:
+            self.report()
+
+    def import_batch(self, batch):
+        """Загружает пачку строк файла в одной транзакции."""
+        self.stats['rows'] += len(batch)
+        # При DEBUG Django копит все запросы, за гигабайтный файл это
+        # съедает память.
+        reset_queries()
+        items = {}
+        for number, row in batch:
+            try:
+                news = clean_news(row)
+            except ValidationError as error:
+                self.error(number, error)
+                continue
+            # Повтор id внутри пачки: побеждает последняя строка.
+            items[news.external_id] = (number, news, row.get('comments'))
+
+        with transaction.atomic():
+            existing = {
+                stored.pop('external_id'): stored
+                for stored in News.objects.filter(
+                    external_id__in=items
+                ).values('external_id', 'pk', *NEWS_FIELDS)
+            }
+            created, updated = [], []
+            for _, news, _ in items.values():
+                stored = existing.get(news.external_id)
+                if stored is None:
+                    if news.date is None:
+                        news.date = News._meta.get_field('date').get_default()
+                    created.append(news)
+                    continue
+                news.pk = stored.pop('pk')
+                if news.date is None:
+                    news.date = stored['date']
+                # Повторная загрузка того же файла ничего не переписывает.
+                if stored != {name: getattr(news, name) for name in stored}:
+                    news.modified = timezone.now()
+                    updated.append(news)
+            News.objects.bulk_update(updated, (*NEWS_FIELDS, 'modified'))
+            News.objects.bulk_create(created)
+            self.stats['created'] += len(created)
+            self.stats['updated'] += len(updated)
+            if any(comments for _, _, comments in items.values()):
+                self.import_comments(items)
+
+    def import_comments(self, items):
+        """Добавляет комментарии к новостям пачки."""
+        # SQLite не возвращает pk из bulk_create, берём их запросом.
+        news_ids = dict(
+            News.objects.filter(external_id__in=items).values_list(
+                'external_id', 'pk'
+            )
+        )
+        usernames = {
+            data.get('author')
+            for _, _, comments in items.values()
+            if isinstance(comments, list)
+            for data in comments
+            if isinstance(data, dict)
+        }
+        user_ids = dict(
+            User.objects.filter(username__in=usernames).values_list(
+                'username', 'pk'
+            )
+        )
+        comments = []
+        for external_id, (number, _, rows) in items.items():
+            if not rows:
+                continue
+            if not isinstance(rows, list):
+                self.error(number, ValidationError('comments не список.'))
+                continue
+            for data in rows:
+                try:
+                    comment = clean_comment(data, user_ids)
+                except ValidationError as error:
+                    self.error(number, error)
+                    continue
+                comment.news_id = news_ids[external_id]
+                comments.append(comment)
+        comments = self.new_comments(comments)
+        Comment.objects.bulk_create(comments)
+        self.stats['comments'] += len(comments)
+
+        counts = (
+            Comment.objects.filter(news=OuterRef('pk'))
+            .order_by()
+            .values('news')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        News.objects.filter(
+            pk__in={comment.news_id for comment in comments}
+        ).update(
+            comment_count=Coalesce(Subquery(counts), 0),
+            modified=timezone.now(),
+        )
+
+    def new_comments(self, comments):
+        """
+        Комментарии пачки без уже сохранённых и повторов внутри пачки.
+
+        Повторная загрузка узнаёт комментарий по его id у новости,
+        поэтому запрос ограничен id из пачки, а не всей веткой.
+        Комментарии без id не сравниваются: одинаковые тексты одного
+        автора бывают и настоящими.
+        """
+        external_ids = {
+            comment.external_id
+            for comment in comments
+            if comment.external_id is not None
+        }
+        if not external_ids:
+            return comments
+        seen = set(
+            Comment.objects.filter(
+                news_id__in={comment.news_id for comment in comments},
+                external_id__in=external_ids,
+            ).values_list('news_id', 'external_id')
+        )
+        new = []
+        for comment in comments:
+            if comment.external_id is not None:
+                key = (comment.news_id, comment.external_id)
+                if key in seen:
+                    continue
+                seen.add(key)
+            new.append(comment)
+        return new
+
+    def error(self, number, error):
+        self.stats['errors'] += 1
+        if self.verbosity:
+            self.stderr.write(f'Строка {number}: {describe(error)}')
+
+    def report(self):
+        if not self.verbosity:
+            return
+        elapsed = time.perf_counter() - self.started
+        stats = self.stats
+        self.stdout.write(
+            f'Строк: {stats["rows"]}, создано: {stats["created"]}, '
+            f'обновлено: {stats["updated"]}, '
+            f'комментариев: {stats["comments"]}, '
+            f'ошибок: {stats["errors"]} за {elapsed:.1f} с '
+            f'({stats["rows"] / max(elapsed, 1e-9):.0f} строк/с)'
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from news.cache import bump_generation
+from news.models import Comment, News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у новостей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько новостей обновлять в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        counts = (
+            Comment.objects.filter(news=OuterRef('pk'))
+            .order_by()
+            .values('news')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        last_pk = News.objects.aggregate(last=Max('pk'))['last'] or 0
+        updated = 0
+        for start in range(0, last_pk, batch_size):
+            with transaction.atomic():
+                updated += News.objects.filter(
+                    pk__gt=start, pk__lte=start + batch_size
+                ).update(
+                    comment_count=Coalesce(Subquery(counts), 0),
+                    modified=timezone.now(),
+                )
+        # QuerySet.update не отправляет сигналы, сбрасываем кеш сами.
+        bump_generation()
+        if options['verbosity']:
+            self.stdout.write(f'Обновлено новостей: {updated}')
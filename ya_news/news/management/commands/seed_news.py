@@ -0,0 +1,150 @@
+import time
+from contextlib import nullcontext
+from datetime import date, timedelta
+from multiprocessing import Lock, Pool
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from news.cache import bump_generation
+from news.models import Comment, News
+
+User = get_user_model()
+
+SEED_USER_PREFIX = 'seed-user-'
+
+# SQLite допускает только одного писателя: процессы параллельно готовят
+# строки, а вставляют их по очереди, иначе ловят «database is locked».
+write_lock = None
+
+
+def init_worker(lock):
+    """Запоминает в дочернем процессе общую блокировку записи."""
+    global write_lock
+    write_lock = lock
+
+
+def insert_comments(task):
+    """Вставляет комментарии с номерами из [start, stop) пачками."""
+    start, stop, news_ids, user_ids, batch_size = task
+    for batch_start in range(start, stop, batch_size):
+        batch_stop = min(batch_start + batch_size, stop)
+        rows = [
+            Comment(
+                news_id=news_ids[index % len(news_ids)],
+                author_id=user_ids[index % len(user_ids)],
+                text=f'Комментарий {index}',
+            )
+            for index in range(batch_start, batch_stop)
+        ]
+        with write_lock or nullcontext():
+            Comment.objects.bulk_create(rows)
+    return stop - start
+
+
+class Command(BaseCommand):
+    help = 'Создаёт синтетические новости, комментарии и пользователей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--news', type=int, default=1_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5_000,
+            help='Сколько строк вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Сколько процессов создают комментарии.',
+        )
+
+    def report(self, label, rows, started):
+        if not self.verbosity:
+            return
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label}: {rows} за {elapsed:.1f} с '
+            f'({rows / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        batch_size = options['batch_size']
+
+        started = time.perf_counter()
+        first_user = User.objects.count()
+        User.objects.bulk_create(
+            (
+                User(username=f'{SEED_USER_PREFIX}{index}')
+                for index in range(first_user, first_user + options['users'])
+            ),
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        # Имена могли быть заняты, и такие строки пропущены.
+        self.report('Пользователи', User.objects.count() - first_user, started)
+        # Синтетические данные не приписываем настоящим пользователям.
+        user_ids = list(
+            User.objects.filter(
+                username__startswith=SEED_USER_PREFIX
+            ).values_list('pk', flat=True)
+        )
+
+        started = time.perf_counter()
+        last_news = News.objects.order_by('-pk').values_list('pk').first()
+        today = date.today()
+        for batch_start in range(0, options['news'], batch_size):
+            batch_stop = min(batch_start + batch_size, options['news'])
+            News.objects.bulk_create(
+                News(
+                    title=f'Новость {index}',
+                    text='Просто текст. ' * 20,
+                    date=today - timedelta(days=index % 3650),
+                )
+                for index in range(batch_start, batch_stop)
+            )
+        news_ids = list(
+            News.objects.filter(
+                pk__gt=last_news[0] if last_news else 0
+            ).values_list('pk', flat=True)
+        )
+        self.report('Новости', len(news_ids), started)
+        if news_ids:
+            # Массовая вставка не отправляет сигналы, сбрасываем кеш сами.
+            bump_generation()
+        if not news_ids or not user_ids or not options['comments']:
+            return
+
+        started = time.perf_counter()
+        workers = max(1, options['workers'])
+        step = -(-options['comments'] // workers)
+        tasks = [
+            (
+                start,
+                min(start + step, options['comments']),
+                news_ids,
+                user_ids,
+                batch_size,
+            )
+            for start in range(0, options['comments'], step)
+        ]
+        if workers == 1:
+            created = sum(map(insert_comments, tasks))
+        else:
+            # Дочерние процессы открывают собственные соединения с БД.
+            connections.close_all()
+            sqlite = connections['default'].vendor == 'sqlite'
+            lock = Lock() if sqlite else None
+            with Pool(workers, init_worker, (lock,)) as pool:
+                created = sum(pool.map(insert_comments, tasks))
+        self.report('Комментарии', created, started)
+
+        started = time.perf_counter()
+        call_command('recount_comments', verbosity=0)
+        self.report('Счётчики комментариев', len(news_ids), started)
@@ -0,0 +1,147 @@
+"""Поиск множества слов в тексте за один проход."""
+import re
+from collections import deque
+
+# Латинские буквы и цифры, которыми подменяют похожие русские буквы.
+HOMOGLYPHS = {
+    'a': 'а',
+    'b': 'в',
+    'c': 'с',
+    'e': 'е',
+    'h': 'н',
+    'k': 'к',
+    'm': 'м',
+    'o': 'о',
+    'p': 'р',
+    't': 'т',
+    'x': 'х',
+    'y': 'у',
+    'ё': 'е',
+    '0': 'о',
+    '3': 'з',
+    '4': 'ч',
+    '6': 'б',
+}
+
+
+# Слова разделяются пробелами, знаки внутри слова — маскировка.
+WORD = re.compile(r'\S+')
+BOUNDARY = ' '
+
+
+def _fold(char):
+    char = char.lower()
+    char = HOMOGLYPHS.get(char, char)
+    return char if char.isalnum() else ''
+
+
+def normalize(text):
+    """
+    Приводит текст к виду, в котором слово не спрятать.
+
+    Заменяет похожие латинские буквы русскими, убирает знаки внутри
+    слова и схлопывает повторы букв. Пробел между словами остаётся
+    границей, чтобы слово не складывалось из соседних; убирается он
+    только между одиночными буквами, как в «р е д и с к а». Текст
+    обрабатывается потоком, по одной операции со словарём на символ.
+    """
+    table = {}
+    previous = ''
+    previous_single = None
+    for match in WORD.finditer(text):
+        letters = []
+        for char in match.group():
+            folded = table.get(char)
+            if folded is None:
+                folded = table[char] = _fold(char)
+            if folded:
+                letters.append(folded)
+        if not letters:
+            continue
+        single = len(letters) == 1
+        if previous_single is not None and not (single and previous_single):
+            previous = BOUNDARY
+            yield BOUNDARY
+        previous_single = single
+        for folded in letters:
+            if folded != previous:
+                previous = folded
+                yield folded
+
+
+class WordMatcher:
+    """
+    Автомат Ахо — Корасик для набора слов.
+
+    Строится один раз, после чего поиск занимает время, линейное
+    по длине текста, независимо от количества слов. Если задан
+    normalizer, им обрабатываются и слова, и текст, а в результате
+    возвращаются исходные слова.
+    """
+
+    def __init__(self, words, normalizer=None):
+        self._normalizer = normalizer
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for word in words:
+            self._add(word.lower())
+        self._build_links()
+
+    def _chars(self, text):
+        if self._normalizer is None:
+            return text.lower()
+        return self._normalizer(text)
+
+    def _add(self, word):
+        state = 0
+        for char in self._chars(word):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if state and word not in self._output[state]:
+            self._output[state] += (word,)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                # Слова, оканчивающиеся в суффиксном состоянии, тоже
+                # найдены в текущем: объединяем выходы заранее.
+                self._output[next_state] += self._output[fail]
+
+    def find(self, text):
+        """Возвращает множество слов, встретившихся в тексте."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set()
+        state = 0
+        for char in self._chars(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+def load_words(path):
+    """Читает слова из файла: по одному в строке, # начинает комментарий."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            word = line.split('#', 1)[0].strip()
+            if word:
+                yield word
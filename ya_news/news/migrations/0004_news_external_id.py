@@ -0,0 +1,24 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('news', '0003_news_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='external_id',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name='Идентификатор во внешней системе',
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.15 on 2026-10-18 21:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('news', '0004_news_external_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='modified',
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text='Время изменения новости или её комментариев.',
+                verbose_name='Изменена',
+            ),
+            preserve_default=False,
+        ),
+    ]
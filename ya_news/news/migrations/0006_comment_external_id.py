@@ -0,0 +1,30 @@
+# Generated by Django 3.2.15 on 2026-10-18 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('news', '0005_news_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='external_id',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                verbose_name='Идентификатор во внешней системе',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='comment',
+            constraint=models.UniqueConstraint(
+                fields=('news', 'external_id'),
+                name='comment_news_external_id_uniq',
+            ),
+        ),
+    ]
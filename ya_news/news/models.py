@@ -1,16 +1,35 @@
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(
+        'Комментариев', default=0, editable=False
+    )
+    modified = models.DateTimeField(
+        'Изменена',
+        auto_now=True,
+        help_text='Время изменения новости или её комментариев.',
+    )
+    external_id = models.CharField(
+        'Идентификатор во внешней системе',
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         ordering = ('-date',)
+        indexes = (models.Index(fields=('-date', 'id'), name='news_date_idx'),)
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -26,9 +45,63 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    external_id = models.CharField(
+        'Идентификатор во внешней системе',
+        max_length=64,
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         ordering = ('created',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('news', 'external_id'),
+                name='comment_news_external_id_uniq',
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('news', 'created'), name='comment_news_created_idx'
+            ),
+            models.Index(
+                fields=('author', 'created'),
+                name='comment_author_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+    def save(self, *args, **kwargs):
+        """
+        Запись комментария отмечает новость изменённой.
+
+        Новый комментарий к тому же увеличивает счётчик комментариев.
+        """
+        changes = {'modified': timezone.now()}
+        if self._state.adding:
+            changes['comment_count'] = F('comment_count') + 1
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            News.objects.filter(pk=self.news_id).update(**changes)
+
+    def delete(self, *args, **kwargs):
+        """
+        Удаление комментария уменьшает счётчик комментариев новости
+        и отмечает её изменённой.
+
+        Каскадное и массовое удаление счётчик не обновляют, для них есть
+        команда recount_comments.
+        """
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            # Комментарий уже удалил параллельный запрос.
+            if not deleted[0]:
+                return deleted
+            News.objects.filter(pk=self.news_id).update(
+                comment_count=F('comment_count') - 1,
+                modified=timezone.now(),
+            )
+        return deleted
@@ -0,0 +1,110 @@
+"""
+Постраничный вывод по ключу вместо OFFSET.
+
+Комментарии идут по (created, id), новости — по (-date, id).
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from django.db.models import Q
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Наибольший id BigAutoField: больший SQLite не примет в запросе.
+MAX_PK = 2**63 - 1
+
+
+def encode_position(created, pk):
+    """Курсор на комментарий: микросекунды от начала эпохи и id."""
+    microseconds = (created - EPOCH) // timedelta(microseconds=1)
+    return f'{microseconds}-{pk}'
+
+
+def encode_cursor(comment):
+    return encode_position(comment.created, comment.pk)
+
+
+def parse_pk(value):
+    """id из строки или None, если это не id записи."""
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        return None
+    if not 0 < pk <= MAX_PK:
+        return None
+    return pk
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор, для некорректного значения возвращает None."""
+    try:
+        microseconds, pk = cursor.split('-')
+        # Вне диапазона datetime — OverflowError.
+        created = EPOCH + timedelta(microseconds=int(microseconds))
+    except (AttributeError, ValueError, OverflowError):
+        return None
+    pk = parse_pk(pk)
+    if pk is None:
+        return None
+    return created, pk
+
+
+def split_page(rows, page_size, encode):
+    """
+    Страница и курсор следующей страницы (или None).
+
+    Выбирается на одну строку больше страницы: лишняя строка показывает,
+    что следующая страница есть.
+    """
+    rows = list(rows[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode(rows[-1])
+
+
+def comments_page(queryset, cursor, page_size, encode=encode_cursor):
+    """
+    Страница комментариев, следующих за курсором.
+
+    Вместо OFFSET продолжаем выборку с последнего показанного
+    комментария, поэтому любая страница стоит столько же, сколько первая.
+    Возвращает комментарии и курсор следующей страницы (или None),
+    который строит encode по последнему комментарию.
+    """
+    queryset = queryset.order_by('created', 'pk')
+    position = decode_cursor(cursor)
+    if position is not None:
+        created, pk = position
+        queryset = queryset.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    return split_page(queryset, page_size, encode)
+
+
+def encode_news_position(news_date, pk):
+    """Курсор на новость: порядковый номер даты и id."""
+    return f'{news_date.toordinal()}-{pk}'
+
+
+def decode_news_cursor(cursor):
+    """Разбирает курсор новости, для некорректного значения — None."""
+    try:
+        ordinal, pk = cursor.split('-')
+        news_date = date.fromordinal(int(ordinal))
+    except (AttributeError, ValueError, OverflowError):
+        return None
+    pk = parse_pk(pk)
+    if pk is None:
+        return None
+    return news_date, pk
+
+
+def news_page(queryset, cursor, page_size, encode):
+    """Страница новостей от свежих к старым, следующих за курсором."""
+    queryset = queryset.order_by('-date', 'pk')
+    position = decode_news_cursor(cursor)
+    if position is not None:
+        news_date, pk = position
+        queryset = queryset.filter(
+            Q(date__lt=news_date) | Q(date=news_date, pk__gt=pk)
+        )
+    return split_page(queryset, page_size, encode)
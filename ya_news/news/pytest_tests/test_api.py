@@ -0,0 +1,129 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def many_news(settings):
+    settings.NEWS_API_PAGE_SIZE = 2
+    today = timezone.now().date()
+    # По две новости на день: страницы делятся и внутри одной даты.
+    return News.objects.bulk_create(
+        News(
+            title=f'Новость {index}',
+            text='Текст',
+            date=today - timedelta(days=index // 2),
+        )
+        for index in range(5)
+    )
+
+
+def test_news_fields_are_selected(client, news):
+    response = client.get(
+        reverse('news:api_news'), {'fields': 'title,date'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [{'title': news.title, 'date': news.date.isoformat()}],
+        'next': None,
+    }
+    assert response['X-DB-Queries'] == '1'
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get(reverse('news:api_news'), {'fields': 'title,pk'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'pk' in response.json()['error']
+
+
+def test_news_are_paged_by_cursor(client, many_news):
+    url = reverse('news:api_news') + '?fields=id'
+    ids = []
+    while url:
+        data = client.get(url).json()
+        assert len(data['results']) <= 2
+        ids += [row['id'] for row in data['results']]
+        url = data['next']
+    expected = News.objects.order_by('-date', 'pk').values_list(
+        'id', flat=True
+    )
+    assert ids == list(expected)
+
+
+def test_comments_page(client, comment, news, author, settings):
+    settings.COMMENTS_COUNT_ON_NEWS_PAGE = 1
+    later = Comment.objects.create(news=news, author=author, text='Ещё')
+    url = reverse('news:api_comments', args=[news.pk])
+    response = client.get(url)
+    assert response['X-DB-Queries'] == '2'
+    data = response.json()
+    assert data['results'] == [
+        {
+            'id': comment.pk,
+            'author': author.username,
+            'created': data['results'][0]['created'],
+            'text': comment.text,
+        }
+    ]
+    data = client.get(data['next']).json()
+    assert [row['id'] for row in data['results']] == [later.pk]
+    assert data['next'] is None
+
+
+def test_comments_of_unknown_news_are_not_found(client):
+    response = client.get(reverse('news:api_comments', args=[0]))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert 'error' in response.json()
+
+
+def test_etag_changes_with_comments(client, news, author):
+    url = reverse('news:api_comments', args=[news.pk])
+    etag = client.get(url)['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    Comment.objects.create(news=news, author=author, text='Новый')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_list_etag_depends_on_fields(client, news):
+    url = reverse('news:api_news')
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+    response = client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_empty_field_selection_is_rejected(client):
+    response = client.get(reverse('news:api_news'), {'fields': ','})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['error'].startswith('Не выбрано ни одного поля.')
+
+
+@pytest.mark.parametrize(
+    'name, cursor',
+    (
+        ('news:api_news', '700000-99999999999999999999999'),
+        ('news:api_news', '99999999999999999999-1'),
+        ('news:api_comments', '1-99999999999999999999999'),
+        ('news:api_comments', '99999999999999999999-1'),
+    ),
+)
+def test_out_of_range_cursor_returns_first_page(
+    client, comment, news, name, cursor
+):
+    args = [news.pk] if name == 'news:api_comments' else []
+    response = client.get(reverse(name, args=args), {'after': cursor})
+    assert response.status_code == HTTPStatus.OK
+    assert [row['id'] for row in response.json()['results']] == [
+        comment.pk if args else news.pk
+    ]
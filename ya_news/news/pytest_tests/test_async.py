@@ -0,0 +1,149 @@
+import importlib
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Permission
+from django.test import AsyncClient
+from django.urls import clear_url_caches, reverse
+
+import news.urls
+import yanews.urls
+from news.models import Comment
+from yanews import offload
+
+# Асинхронные представления работают с БД из других потоков, которые
+# не видят данных незавершённой транзакции теста.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def async_views(settings):
+    """Подключает асинхронные представления, как это делает asgi.py."""
+
+    def reload_urls():
+        importlib.reload(news.urls)
+        importlib.reload(yanews.urls)
+        clear_url_caches()
+
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+def call(method, *args, **kwargs):
+    """Синхронно выполняет запрос AsyncClient."""
+
+    async def request():
+        return await method(*args, **kwargs)
+
+    return async_to_sync(request)()
+
+
+def get(client, url, **headers):
+    # AsyncClient в Django 3.2 принимает заголовки под их именами в HTTP.
+    return call(client.get, url, **headers)
+
+
+def test_home_page_is_served_from_cache_in_pool(news, monkeypatch):
+    client = AsyncClient()
+    url = reverse('news:home')
+    calls = []
+    run_sync = offload.run_sync
+
+    def counting_run_sync(func, *args, **kwargs):
+        calls.append(func)
+        return run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(offload, 'run_sync', counting_run_sync)
+    response = get(client, url)
+    assert response.status_code == HTTPStatus.OK
+    # Запрос списка новостей выполнен в пуле потоков и посчитан.
+    assert response['X-DB-Queries'] == '1'
+
+    # Кеш читается тоже в пуле, а не в цикле событий.
+    response = get(client, url)
+    assert response['X-DB-Queries'] == '0'
+    assert news.title in response.content.decode()
+    assert len(calls) == 2
+
+    response = get(client, url, **{'If-None-Match': response['ETag']})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_news_page_for_author(author, comment, news):
+    client = AsyncClient()
+    client.force_login(author)
+    response = get(client, reverse('news:detail', args=[news.pk]))
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert comment.text in content
+    assert reverse('news:edit', args=[comment.pk]) in content
+    assert 'private' in response['Cache-Control']
+
+
+def test_comment_posted_through_async_view(author, news):
+    client = AsyncClient()
+    client.force_login(author)
+    # Multipart-тело AsyncClient в Django 3.2 читать не умеет.
+    response = call(
+        client.post,
+        reverse('news:detail', args=[news.pk]),
+        urlencode({'text': 'Асинхронный комментарий'}),
+        content_type='application/x-www-form-urlencoded',
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.filter(
+        news=news, author=author, text='Асинхронный комментарий'
+    ).exists()
+
+
+# Маршрут: аргументы для reverse, нужен ли вход автора комментария
+# и ожидаемый статус ответа.
+ROUTES = {
+    'news:home': (lambda comment: {}, False, HTTPStatus.OK),
+    'news:detail': (
+        lambda comment: {'pk': comment.news_id}, False, HTTPStatus.OK
+    ),
+    # Сам поток обслуживает обёртка из news.live, см. test_live.py.
+    'news:live': (
+        lambda comment: {'pk': comment.news_id},
+        False,
+        HTTPStatus.NO_CONTENT,
+    ),
+    'news:edit': (lambda comment: {'pk': comment.pk}, True, HTTPStatus.OK),
+    'news:delete': (lambda comment: {'pk': comment.pk}, True, HTTPStatus.OK),
+    'news:export': (
+        lambda comment: {'pk': comment.news_id, 'file_format': 'csv'},
+        True,
+        HTTPStatus.OK,
+    ),
+    'news:api_news': (lambda comment: {}, False, HTTPStatus.OK),
+    'news:api_comments': (
+        lambda comment: {'pk': comment.news_id}, False, HTTPStatus.OK
+    ),
+    'users:login': (lambda comment: {}, False, HTTPStatus.OK),
+    'users:signup': (lambda comment: {}, False, HTTPStatus.OK),
+    'users:logout': (lambda comment: {}, False, HTTPStatus.OK),
+    'admin:index': (lambda comment: {}, True, HTTPStatus.FOUND),
+}
+
+
+def test_every_route_is_checked_under_asgi():
+    names = {f'news:{pattern.name}' for pattern in news.urls.urlpatterns}
+    assert names - set(ROUTES) == set()
+
+
+@pytest.mark.parametrize('name', ROUTES)
+def test_route_under_asgi(name, asgi_get, client, author, comment):
+    kwargs, login, expected = ROUTES[name]
+    if login:
+        author.user_permissions.add(
+            Permission.objects.get(codename='view_comment')
+        )
+        client.force_login(author)
+    status, _, _ = asgi_get(reverse(name, kwargs=kwargs(comment)), client)
+    assert status == expected
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from news.models import Comment, News
+
+HOME_URL = reverse('news:home')
+
+
+@pytest.mark.django_db
+def test_warm_home_page_makes_no_queries(
+    client, news, django_assert_num_queries
+):
+    client.get(HOME_URL)
+    with django_assert_num_queries(0):
+        response = client.get(HOME_URL)
+    assert response.status_code == HTTPStatus.OK
+    assert news.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_news_write_invalidates_home_page(client, news):
+    client.get(HOME_URL)
+    News.objects.create(title='Свежая новость', text='Текст')
+    response = client.get(HOME_URL)
+    assert 'Свежая новость' in response.content.decode()
+
+    news.delete()
+    response = client.get(HOME_URL)
+    assert news.title not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_write_invalidates_home_page(client, news, author):
+    response = client.get(HOME_URL)
+    assert 'Комментариев' not in response.content.decode()
+
+    comment = Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(HOME_URL)
+    assert 'Комментариев: 1' in response.content.decode()
+
+    comment.delete()
+    response = client.get(HOME_URL)
+    assert 'Комментариев' not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_home_page_not_cached_for_authenticated_user(author_client, author):
+    author_client.get(HOME_URL)
+    response = author_client.get(HOME_URL)
+    assert response.context is not None
+    assert author.username in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_home_page_not_modified_without_queries(
+    client, news, author, django_assert_num_queries
+):
+    etag = client.get(HOME_URL)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(HOME_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert 'Cookie' in response['Vary']
+
+    Comment.objects.create(news=news, author=author, text='Новый')
+    response = client.get(HOME_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_news_detail_not_modified_until_thread_changes(
+    client, comment, django_assert_num_queries
+):
+    url = reverse('news:detail', args=(comment.news_id,))
+    response = client.get(url)
+    etag = response['ETag']
+    assert response.has_header('Last-Modified')
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    etag = response['ETag']
+
+    comment.delete()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_news_detail_etag_depends_on_user(author_client, vasua, news):
+    url = reverse('news:detail', args=(news.pk,))
+    anonymous_etag = Client().get(url)['ETag']
+    response = author_client.get(url)
+    assert response['ETag'] != anonymous_etag
+    assert not response.has_header('Last-Modified')
+    assert 'private' in response['Cache-Control']
+    vasua_client = Client()
+    vasua_client.force_login(vasua)
+    response = vasua_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_comment_thread_rendered_once(
+    client, comment, django_assert_num_queries
+):
+    url = reverse('news:detail', args=(comment.news_id,))
+    client.get(url)
+    # Время изменения новости для ETag и сама новость; комментарии
+    # берутся из кеша.
+    with django_assert_num_queries(2):
+        response = client.get(url)
+    assert comment.text in response.content.decode()
+
+    Comment.objects.create(
+        news=comment.news, author=comment.author, text='Свежий комментарий'
+    )
+    assert 'Свежий комментарий' in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_cached_thread_shows_controls_only_to_author(
+    author_client, vasua, comment
+):
+    url = reverse('news:detail', args=(comment.news_id,))
+    edit_url = reverse('news:edit', args=(comment.pk,))
+    assert edit_url not in Client().get(url).content.decode()
+    assert edit_url in author_client.get(url).content.decode()
+    vasua_client = Client()
+    vasua_client.force_login(vasua)
+    content = vasua_client.get(url).content.decode()
+    assert edit_url not in content
+    assert '<!--controls' not in content
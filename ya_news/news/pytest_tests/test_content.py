@@ -1,12 +1,21 @@
+import re
+import tracemalloc
 from http import HTTPStatus
 
 import pytest
 from django.urls import reverse
 
-from news.models import News
+from news.models import Comment, News
 from yanews.settings import NEWS_COUNT_ON_HOME_PAGE
 from news.forms import CommentForm
 
+COMMENT_TEXT = re.compile(r'<p class="mb-0">(.*?)</p>')
+
+
+def shown_texts(response):
+    """Тексты комментариев на странице новости."""
+    return COMMENT_TEXT.findall(response.context['comments_html'])
+
 
 @pytest.mark.django_db
 def test_home_page_news_count(client):
@@ -34,6 +43,43 @@ def test_home_page_news_order(client):
     assert list(news_list) == list(sorted_news)
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('comments_per_news', (0, 1, 50))
+def test_home_page_query_count_independent_of_comments(
+    author_client, author, comments_per_news, django_assert_num_queries
+):
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Просто текст.')
+        for index in range(NEWS_COUNT_ON_HOME_PAGE)
+    )
+    Comment.objects.bulk_create(
+        Comment(news_id=pk, author=author, text='Текст комментария')
+        for pk in News.objects.values_list('pk', flat=True)
+        for _ in range(comments_per_news)
+    )
+    # Сессия и пользователь, плюс один запрос на список новостей.
+    with django_assert_num_queries(3):
+        response = author_client.get(reverse('news:home'))
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_home_page_does_not_load_comment_text(author_client, author, news):
+    text_size = 10_000
+    comments_count = 200
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='ы' * text_size)
+        for _ in range(comments_count)
+    )
+    News.objects.filter(pk=news.pk).update(comment_count=comments_count)
+    tracemalloc.start()
+    response = author_client.get(reverse('news:home'))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert f'Комментариев: {comments_count}' in response.content.decode()
+    assert peak < text_size * comments_count / 4
+
+
 def test_comments_order_on_news_detail(client, comment):
     pk_for_news = 1
     url = reverse('news:detail', args=[pk_for_news])
@@ -59,3 +105,54 @@ def test_comment_form_available_for_authenticated_user(author_client, news):
     response = author_client.get(url)
     assert response.status_code == HTTPStatus.OK
     assert isinstance(response.context['form'], CommentForm)
+
+
+@pytest.mark.django_db
+def test_comments_paginated_by_cursor(client, news, author, settings):
+    settings.COMMENTS_COUNT_ON_NEWS_PAGE = 2
+    comments = [
+        Comment.objects.create(news=news, author=author, text=f'Текст {i}')
+        for i in range(5)
+    ]
+    url = reverse('news:detail', args=[news.pk])
+
+    shown = []
+    next_cursor = ''
+    for _ in range(3):
+        response = client.get(url, {'after': next_cursor})
+        page = shown_texts(response)
+        assert len(page) <= settings.COMMENTS_COUNT_ON_NEWS_PAGE
+        shown.extend(page)
+        next_cursor = response.context['next_cursor']
+        if next_cursor:
+            assert f'?after={next_cursor}#comments' in (
+                response.content.decode()
+            )
+    assert next_cursor is None
+    assert shown == [comment.text for comment in comments]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_shows_first_page(client, comment, news):
+    url = reverse('news:detail', args=[news.pk])
+    # Первый запрос рисует страницу, второй берёт её из кеша.
+    for _ in range(2):
+        response = client.get(url, {'after': 'мусор'})
+        assert response.status_code == HTTPStatus.OK
+        assert shown_texts(response) == [comment.text]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'cursor',
+    (
+        '99999999999999999999-1',
+        '1-99999999999999999999999',
+        '1-0',
+    ),
+)
+def test_out_of_range_cursor_shows_first_page(client, comment, news, cursor):
+    url = reverse('news:detail', args=[news.pk])
+    response = client.get(url, {'after': cursor})
+    assert response.status_code == HTTPStatus.OK
+    assert shown_texts(response) == [comment.text]
@@ -0,0 +1,109 @@
+import csv
+import json
+import tracemalloc
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import Comment, News
+
+
+@pytest.fixture
+def exporter_client(author, client):
+    author.user_permissions.add(
+        Permission.objects.get(codename='view_comment')
+    )
+    client.force_login(author)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('file_format', ('csv', 'jsonl'))
+def test_export_streams_comments(exporter_client, comment, file_format):
+    url = reverse('news:export', args=(comment.news_id, file_format))
+    response = exporter_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    content = b''.join(response.streaming_content).decode()
+    if file_format == 'csv':
+        rows = list(csv.DictReader(StringIO(content)))
+    else:
+        rows = [json.loads(line) for line in content.splitlines()]
+    assert rows == [
+        {
+            'id': str(comment.pk) if file_format == 'csv' else comment.pk,
+            'author': comment.author.username,
+            'created': str(comment.created),
+            'text': comment.text,
+        }
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_under_asgi(exporter_client, comment, asgi_get):
+    url = reverse('news:export', args=(comment.news_id, 'csv'))
+    status, headers, content = asgi_get(url, exporter_client)
+    assert status == HTTPStatus.OK
+    # Строки прочитаны в представлении и учтены в бюджете запросов.
+    assert headers['x-db-queries'] == '6'
+    assert headers['content-disposition'] == (
+        f'attachment; filename="news-{comment.news_id}-comments.csv"'
+    )
+    rows = list(csv.DictReader(StringIO(content.decode())))
+    assert [row['text'] for row in rows] == [comment.text]
+
+
+@pytest.mark.django_db
+def test_export_requires_permission(vasua_client, comment):
+    url = reverse('news:export', args=(comment.news_id, 'csv'))
+    response = vasua_client.get(url)
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_export_unknown_format(exporter_client, news):
+    url = reverse('news:export', args=(news.pk, 'xml'))
+    assert exporter_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_export_comments_command(tmp_path, comment):
+    path = tmp_path / 'comments.jsonl'
+    call_command(
+        'export_comments', comment.news_id, format='jsonl', output=path
+    )
+    exported = json.loads(path.read_text(encoding='utf-8'))
+    assert exported['text'] == comment.text
+
+
+@pytest.mark.django_db
+def test_export_memory_does_not_grow_with_thread(
+    exporter_client, author, settings
+):
+    """
+    Пиковая память выгрузки не зависит от длины ветки.
+
+    В тесте ветки из 2 и 20 тысяч комментариев; на миллионе строк
+    поведение то же, см. benchmarks/export_comments.py.
+    """
+    settings.EXPORT_CHUNK_SIZE = 500
+    peaks = []
+    for count in (2_000, 20_000):
+        news = News.objects.create(title=f'Ветка {count}', text='Текст')
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text='Текст комментария ' * 5)
+            for _ in range(count)
+        )
+        url = reverse('news:export', args=(news.pk, 'csv'))
+        tracemalloc.start()
+        response = exporter_client.get(url)
+        lines = sum(1 for _ in response.streaming_content)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert lines == count + 1
+        peaks.append(peak)
+    assert peaks[1] < peaks[0] * 1.5
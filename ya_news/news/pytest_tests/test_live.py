@@ -0,0 +1,182 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.asgi import get_asgi_application
+from django.urls import reverse
+
+from news.live import broker, with_live_comments
+from news.models import Comment
+from yanews.offload import run_sync
+
+# Комментарии сохраняются в пуле потоков, которые не видят данных
+# незавершённой транзакции теста.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+application = with_live_comments(get_asgi_application())
+
+
+class Subscriber:
+    """Клиент потока комментариев: собирает сообщения ASGI-приложения."""
+
+    def __init__(self, path, last_event_id=None, host='testserver'):
+        self.scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', host.encode())],
+        }
+        if last_event_id is not None:
+            self.scope['headers'].append(
+                (b'last-event-id', str(last_event_id).encode())
+            )
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.body_sent = False
+        self.task = None
+
+    async def receive(self):
+        # Django сначала читает тело запроса.
+        if not self.body_sent:
+            self.body_sent = True
+            return {'type': 'http.request', 'body': b''}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        await self.messages.put(message)
+
+    async def connect(self):
+        self.task = asyncio.ensure_future(
+            application(self.scope, self.receive, self.send)
+        )
+        start = await self.messages.get()
+        if start['status'] == HTTPStatus.OK:
+            # Приветствие потока.
+            await self.messages.get()
+        return start['status']
+
+    async def next_event(self):
+        message = await asyncio.wait_for(self.messages.get(), timeout=5)
+        return message['body'].decode()
+
+    async def close(self):
+        self.disconnected.set()
+        await self.task
+
+
+def create_comment(news, author, text):
+    return run_sync(
+        Comment.objects.create, news=news, author=author, text=text
+    )
+
+
+def test_new_comment_reaches_all_subscribers(news, author):
+    async def scenario():
+        subscribers = [
+            Subscriber(reverse('news:live', args=[news.pk]))
+            for _ in range(50)
+        ]
+        for subscriber in subscribers:
+            assert await subscriber.connect() == HTTPStatus.OK
+        comment = await create_comment(news, author, 'Живой комментарий')
+        for subscriber in subscribers:
+            event = await subscriber.next_event()
+            assert event.startswith(f'id: {comment.pk}\nevent: comment\n')
+            assert 'data: ' in event and 'Живой комментарий' in event
+            assert '<!--controls' not in event
+        for subscriber in subscribers:
+            await subscriber.close()
+        assert not broker.has_subscribers(news.pk)
+
+    async_to_sync(scenario)()
+
+
+def test_missed_comments_are_sent_after_reconnect(news, author, comment):
+    async def scenario():
+        missed = await create_comment(news, author, 'Пропущенный')
+        subscriber = Subscriber(
+            reverse('news:live', args=[news.pk]), last_event_id=comment.pk
+        )
+        assert await subscriber.connect() == HTTPStatus.OK
+        event = await subscriber.next_event()
+        assert event.startswith(f'id: {missed.pk}\n')
+        assert comment.text not in event
+        await subscriber.close()
+
+    async_to_sync(scenario)()
+
+
+@pytest.mark.parametrize('last_event_id', ('²', '9' * 23, '-1'))
+def test_invalid_last_event_id_is_ignored(news, comment, last_event_id):
+    async def scenario():
+        subscriber = Subscriber(
+            reverse('news:live', args=[news.pk]),
+            last_event_id=last_event_id,
+        )
+        assert await subscriber.connect() == HTTPStatus.OK
+        # Пропущенное не отдаётся, поток ждёт новых комментариев.
+        assert subscriber.messages.empty()
+        await subscriber.close()
+
+    async_to_sync(scenario)()
+
+
+def test_stream_of_unknown_news_is_not_found():
+    async def scenario():
+        subscriber = Subscriber(reverse('news:live', args=[0]))
+        assert await subscriber.connect() == HTTPStatus.NOT_FOUND
+        await subscriber.task
+
+    async_to_sync(scenario)()
+
+
+def test_stream_with_too_large_pk_is_not_found():
+    async def scenario():
+        subscriber = Subscriber(reverse('news:live', args=['9' * 20]))
+        assert await subscriber.connect() == HTTPStatus.NOT_FOUND
+        await subscriber.task
+
+    async_to_sync(scenario)()
+
+
+def test_stream_checks_allowed_hosts(news):
+    async def scenario():
+        subscriber = Subscriber(
+            reverse('news:live', args=[news.pk]), host='evil.example'
+        )
+        assert await subscriber.connect() == HTTPStatus.BAD_REQUEST
+        await subscriber.task
+        assert not broker.has_subscribers(news.pk)
+
+    async_to_sync(scenario)()
+
+
+def test_stream_is_not_served_by_wsgi(client, news):
+    response = client.get(reverse('news:live', args=[news.pk]))
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+
+def test_news_page_subscribes_to_stream(client, news, settings):
+    url = reverse('news:detail', args=[news.pk])
+    assert 'EventSource' not in client.get(url).content.decode()
+    settings.NEWS_LIVE_COMMENTS = True
+    content = client.get(url).content.decode()
+    assert reverse('news:live', args=[news.pk]) in content
+
+
+def test_slow_subscriber_is_marked_overflowed(settings):
+    settings.NEWS_LIVE_QUEUE_SIZE = 1
+
+    async def scenario():
+        subscription = broker.subscribe(1)
+        broker.publish(1, (1, b'first'))
+        broker.publish(1, (2, b'second'))
+        # События доставляются в цикл через call_soon_threadsafe.
+        await asyncio.sleep(0)
+        assert subscription.overflowed
+        broker.unsubscribe(subscription)
+
+    async_to_sync(scenario)()
@@ -1,6 +1,10 @@
+import csv
+import json
+from datetime import date
 from http import HTTPStatus
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 
 from news.models import Comment, News
@@ -109,3 +113,212 @@ def test_authenticated_user_cannot_delete_comment(vasua_client, comment):
 
     comment_count_after = Comment.objects.count()
     assert comment_count_after == comment_count_before
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comment_writes(author_client, news):
+    url = reverse('news:detail', args=[news.pk])
+    author_client.post(url, data={'text': 'Первый'})
+    author_client.post(url, data={'text': 'Второй'})
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+    comment = Comment.objects.filter(news=news).first()
+    author_client.post(reverse('news:delete', kwargs={'pk': comment.pk}))
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_repeated_delete_decrements_count_once(comment, news):
+    # Два запроса загрузили один комментарий и оба его удаляют.
+    first, second = Comment.objects.get(pk=comment.pk), comment
+    first.delete()
+    second.delete()
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_counters(comment, news):
+    another_news = News.objects.create(title='Другая', text='Текст')
+    News.objects.update(comment_count=100)
+
+    call_command('recount_comments', batch_size=1)
+
+    news.refresh_from_db()
+    another_news.refresh_from_db()
+    assert news.comment_count == 1
+    assert another_news.comment_count == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name, data, view_queries',
+    (
+        # Новость, SAVEPOINT, INSERT, UPDATE счётчика и времени, RELEASE.
+        ('news:detail', {'text': 'Новый комментарий'}, 5),
+        # Комментарий, SAVEPOINT, UPDATE, UPDATE времени изменения новости,
+        # RELEASE.
+        ('news:edit', {'text': 'Исправленный комментарий'}, 5),
+        # Комментарий, SAVEPOINT, DELETE, UPDATE счётчика и времени,
+        # RELEASE.
+        ('news:delete', {}, 5),
+    ),
+)
+def test_comment_writes_query_count(
+    author_client, comment, name, data, view_queries, django_assert_num_queries
+):
+    pk = comment.news_id if name == 'news:detail' else comment.pk
+    url = reverse(name, kwargs={'pk': pk})
+    # Ещё два запроса загружают сессию и пользователя.
+    with django_assert_num_queries(2 + view_queries):
+        response = author_client.post(url, data=data)
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == (
+        reverse('news:detail', kwargs={'pk': comment.news_id}) + '#comments'
+    )
+
+
+@pytest.mark.django_db
+def test_seed_news_creates_consistent_data(django_user_model):
+    call_command(
+        'seed_news', users=3, news=7, comments=50, batch_size=4, verbosity=0
+    )
+    assert django_user_model.objects.count() == 3
+    assert News.objects.count() == 7
+    assert Comment.objects.count() == 50
+    assert sum(News.objects.values_list('comment_count', flat=True)) == 50
+
+
+@pytest.mark.django_db
+def test_seed_news_uses_only_seed_users(author, capsys):
+    call_command('seed_news', users=2, news=3, comments=10, batch_size=4)
+    assert 'Пользователи: 2 ' in capsys.readouterr().out
+    assert not Comment.objects.filter(author=author).exists()
+    # Следующее имя, seed-user-2, уже занято, и пользователь не создаётся.
+    author.delete()
+    call_command('seed_news', users=1, news=0, comments=0)
+    assert 'Пользователи: 0 ' in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_seed_news_without_comments_refreshes_home_page(
+    client, news, settings
+):
+    settings.NEWS_HOME_CACHE_ENABLED = True
+    home_url = reverse('news:home')
+    client.get(home_url)
+    call_command('seed_news', users=1, news=1, comments=0, verbosity=0)
+    assert 'Новость 0' in client.get(home_url).content.decode()
+
+
+@pytest.mark.django_db
+def test_import_news_upserts_rows_with_comments(tmp_path, author, capsys):
+    rows = [
+        {
+            'id': 'cms-1',
+            'title': 'Новость',
+            'text': 'Текст',
+            'date': '2023-05-14',
+            'comments': [
+                {'id': 'c-1', 'author': author.username, 'text': 'Первый'},
+                {'id': 'c-2', 'author': 'Никто', 'text': 'Без автора'},
+                {'id': 'c-3', 'author': author.username, 'text': 'Ты редиска'},
+            ],
+        },
+        {'id': 'cms-2', 'title': '', 'text': 'Без заголовка'},
+        {'id': 'cms-3', 'title': 'Без даты', 'text': 'Текст'},
+    ]
+    path = tmp_path / 'news.jsonl'
+    path.write_text(
+        '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows)
+        + '\nне json\n',
+        encoding='utf-8',
+    )
+    call_command('import_news', path, batch_size=2)
+    errors = capsys.readouterr().err
+    assert 'Строка 2: title' in errors
+    assert 'Строка 4' in errors
+    assert errors.count('Строка 1') == 2
+    assert News.objects.count() == 2
+    imported = News.objects.get(external_id='cms-1')
+    assert imported.comment_count == 1
+    assert imported.comment_set.get().author == author
+
+    # Повторная загрузка того же файла ничего не добавляет.
+    call_command('import_news', path, verbosity=0)
+    assert News.objects.count() == 2
+    assert Comment.objects.count() == 1
+    imported.refresh_from_db()
+    assert imported.comment_count == 1
+
+    rows[0]['title'] = 'Исправленная новость'
+    del rows[0]['date']
+    path.write_text(json.dumps(rows[0]), encoding='utf-8')
+    call_command('import_news', path, verbosity=0)
+    imported.refresh_from_db()
+    assert imported.title == 'Исправленная новость'
+    assert imported.date == date(2023, 5, 14)
+    assert imported.comment_count == 1
+    assert News.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_import_news_keeps_repeated_comments(tmp_path, author):
+    comments = [
+        {'id': 1, 'author': author.username, 'text': '+1'},
+        {'id': 2, 'author': author.username, 'text': '+1'},
+        {'author': author.username, 'text': '+1'},
+        {'id': 1, 'author': author.username, 'text': '+1'},
+    ]
+    row = {'id': 'cms-1', 'title': 'Новость', 'text': 'Текст'}
+    path = tmp_path / 'news.jsonl'
+    path.write_text(json.dumps({**row, 'comments': comments}), 'utf-8')
+    call_command('import_news', path, verbosity=0)
+    news = News.objects.get()
+    assert news.comment_count == 3
+    assert set(
+        news.comment_set.values_list('external_id', flat=True)
+    ) == {'1', '2', None}
+
+    # Комментарий с id не повторяется, без id — добавляется снова.
+    path.write_text(json.dumps({**row, 'comments': comments[1:]}), 'utf-8')
+    call_command('import_news', path, verbosity=0)
+    news.refresh_from_db()
+    assert news.comment_count == 4
+
+
+@pytest.mark.django_db
+def test_import_news_reads_csv(tmp_path):
+    path = tmp_path / 'news.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('id', 'title', 'text', 'date'))
+        writer.writerow(('1', 'Первая', 'Текст\nв две строки', '2023-05-14'))
+        writer.writerow(('2', 'Вторая', 'Текст', 'вчера'))
+    call_command('import_news', path, verbosity=0)
+    news = News.objects.get()
+    assert news.external_id == '1'
+    assert news.text == 'Текст\nв две строки'
+
+
+@pytest.mark.django_db
+def test_import_of_comments_only_refreshes_home_page(
+    tmp_path, author, client, news
+):
+    news.external_id = 'cms-1'
+    news.save()
+    home_url = reverse('news:home')
+    assert 'Комментариев' not in client.get(home_url).content.decode()
+    row = {
+        'id': 'cms-1',
+        'title': news.title,
+        'text': news.text,
+        'date': news.date.isoformat(),
+        'comments': [{'author': author.username, 'text': 'Из файла'}],
+    }
+    path = tmp_path / 'news.jsonl'
+    path.write_text(json.dumps(row, ensure_ascii=False), encoding='utf-8')
+    call_command('import_news', path, verbosity=0)
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
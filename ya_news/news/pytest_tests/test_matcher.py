@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from news.forms import BAD_WORDS, CommentForm
+from news.matcher import WordMatcher, load_words, normalize
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    (
+        ('he said ushers', {'he', 'she', 'hers'}),
+        ('HIS', {'his'}),
+        ('nothing at all', set()),
+        ('', set()),
+    ),
+)
+def test_matcher_finds_overlapping_words(text, expected):
+    matcher = WordMatcher(('he', 'she', 'his', 'hers'))
+    assert matcher.find(text) == expected
+
+
+def test_matcher_agrees_with_substring_search():
+    words = ('аб', 'бв', 'абв', 'в', 'ааб')
+    matcher = WordMatcher(words)
+    text = 'ааабвабаабв'
+    assert matcher.find(text) == {word for word in words if word in text}
+
+
+def test_load_words_skips_comments_and_blanks(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('# словарь\nредиска\n\n  негодяй  # грубо\n')
+    assert list(load_words(path)) == ['редиска', 'негодяй']
+
+
+def test_form_reports_matched_words():
+    form = CommentForm(data={'text': f'Ты {BAD_WORDS[1].upper()}!'})
+    assert not form.is_valid()
+    error = form.errors.as_data()['text'][0]
+    assert error.params == {'words': BAD_WORDS[1]}
+
+
+def test_matcher_follows_bad_words_file(settings, tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('брокколи\n', encoding='utf-8')
+    assert CommentForm(data={'text': 'брокколи'}).is_valid()
+    settings.NEWS_BAD_WORDS_FILE = str(path)
+    assert not CommentForm(data={'text': 'брокколи'}).is_valid()
+    # Правка словаря подхватывается без перезапуска.
+    path.write_text('шпинат\n', encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert CommentForm(data={'text': 'брокколи'}).is_valid()
+    assert not CommentForm(data={'text': 'шпинат'}).is_valid()
+    settings.NEWS_BAD_WORDS_FILE = None
+    assert CommentForm(data={'text': 'шпинат'}).is_valid()
+
+
+def test_normalize_folds_separators_repeats_and_homoglyphs():
+    assert ''.join(normalize('Р.е-д.иииска')) == 'редиска'
+    assert ''.join(normalize('р е д  и с к а')) == 'редиска'
+
+
+def test_normalize_keeps_boundaries_between_words():
+    assert ''.join(normalize('Ел редис, каша!')) == 'ел редис каша'
+    assert ''.join(normalize('а ну р е д')) == 'а ну ред'
+    assert ''.join(normalize('PEДиcкa')) == 'редиска'
+
+
+@pytest.mark.parametrize(
+    'text',
+    (
+        'нeгодяй',
+        'н е г о д я й',
+        'не-го-дяй!',
+        'нееегоодддяяй',
+        'НEГOДЯЙ',
+        'p.e.д.и.c.к.a',
+    ),
+)
+def test_form_rejects_disguised_bad_words(text):
+    form = CommentForm(data={'text': text})
+    assert not form.is_valid()
+    assert 'text' in form.errors
+
+
+@pytest.mark.parametrize(
+    'text',
+    (
+        'Хороший комментарий',
+        'Ссора, редис.',
+        'Вчера ел редис, каша была вкусная',
+        'Весь день ел редис; капуста кончилась',
+    ),
+)
+def test_form_accepts_clean_text(text):
+    assert CommentForm(data={'text': text}).is_valid()
@@ -0,0 +1,34 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from yanews.middleware import QueryBudgetExceeded
+
+HOME_URL = reverse('news:home')
+
+
+@pytest.mark.django_db
+def test_query_stats_in_headers(author_client):
+    response = author_client.get(HOME_URL)
+    # Сессия, пользователь и список новостей.
+    assert response['X-DB-Queries'] == '3'
+    assert float(response['X-DB-Time']) >= 0
+
+
+@pytest.mark.django_db
+def test_budget_violation_fails_in_strict_mode(author_client, settings):
+    settings.QUERY_BUDGETS = {'news:home': 1}
+    with pytest.raises(QueryBudgetExceeded):
+        author_client.get(HOME_URL)
+
+
+@pytest.mark.django_db
+def test_budget_violation_logged_otherwise(author_client, settings, caplog):
+    settings.QUERY_BUDGETS = {'news:home': 1}
+    settings.QUERY_BUDGET_STRICT = False
+    with caplog.at_level(logging.WARNING, logger='yanews.queries'):
+        response = author_client.get(HOME_URL)
+    assert response.status_code == HTTPStatus.OK
+    assert 'news:home: 3 запросов к БД при бюджете 1' in caplog.text
@@ -0,0 +1,30 @@
+import pytest
+from django.urls import reverse
+
+from news.pagination import encode_cursor
+
+
+@pytest.mark.django_db
+def test_home_page_uses_indexes(client, news, settings, assert_no_full_scans):
+    settings.NEWS_HOME_CACHE_ENABLED = False
+    with assert_no_full_scans():
+        client.get(reverse('news:home'))
+
+
+@pytest.mark.django_db
+def test_detail_pages_use_indexes(
+    author_client, comment, news, assert_no_full_scans
+):
+    url = reverse('news:detail', args=[news.pk])
+    with assert_no_full_scans():
+        author_client.get(url)
+        author_client.get(url, {'after': encode_cursor(comment)})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ('news:edit', 'news:delete'))
+def test_comment_pages_use_indexes(
+    author_client, name, pk_for_kwargs, assert_no_full_scans
+):
+    with assert_no_full_scans():
+        author_client.get(reverse(name, kwargs=pk_for_kwargs))
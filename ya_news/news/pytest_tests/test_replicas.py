@@ -0,0 +1,136 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections, router
+from django.test import Client
+from django.urls import reverse
+
+from news.models import Comment, News
+from yanews.middleware import ReadYourWritesMiddleware
+
+REPLICAS = ['replica1', 'replica2']
+PIN_COOKIE = ReadYourWritesMiddleware.cookie_name
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Реплики — копии файлов SQLite.'
+)
+
+
+@pytest.fixture
+def replicas(settings, tmp_path):
+    """
+    Реплики — отдельные файлы SQLite с копией тестовой БД.
+
+    Копия снимается один раз, и дальнейшие записи в default на
+    репликах не видны, как при отставании репликации. Фикстуру нужно
+    запрашивать последней, после создания данных.
+    """
+    connection.ensure_connection()
+    for alias in REPLICAS:
+        path = tmp_path / f'{alias}.sqlite3'
+        replica = sqlite3.connect(path)
+        connection.connection.backup(replica)
+        replica.close()
+        connections.databases[alias] = {
+            **connections.databases['default'],
+            'NAME': str(path),
+        }
+    settings.DATABASE_REPLICAS = REPLICAS
+    yield REPLICAS
+    for alias in REPLICAS:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+
+
+@pytest.fixture
+def author_client(author):
+    client = Client()
+    client.force_login(author)
+    return client
+
+
+def test_without_replicas_everything_uses_default():
+    assert router.db_for_read(News) == 'default'
+    assert router.db_for_write(News) == 'default'
+
+
+def test_reads_rotate_over_replicas(settings):
+    settings.DATABASE_REPLICAS = REPLICAS
+    aliases = [router.db_for_read(News) for _ in range(4)]
+    assert sorted(aliases) == sorted(REPLICAS * 2)
+    assert aliases[0] != aliases[1]
+    assert router.db_for_write(Comment) == 'default'
+
+
+def test_least_recently_used_replica_is_chosen(settings):
+    settings.DATABASE_REPLICAS = REPLICAS
+    settings.DATABASE_REPLICA_STRATEGY = 'least_recently_used'
+    first = router.db_for_read(News)
+    second = router.db_for_read(News)
+    assert {first, second} == set(REPLICAS)
+    assert router.db_for_read(News) == first
+
+
+def test_replicas_are_not_migrated(settings):
+    settings.DATABASE_REPLICAS = REPLICAS
+    assert not router.allow_migrate('replica1', 'news')
+    assert router.allow_migrate('default', 'news')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_anonymous_reads_come_from_replicas(client, news, replicas):
+    News.objects.using('default').filter(pk=news.pk).update(
+        title='Только в основной БД'
+    )
+    response = client.get(reverse('news:detail', args=[news.pk]))
+    assert response.status_code == HTTPStatus.OK
+    assert news.title in response.content.decode()
+    assert PIN_COOKIE not in response.cookies
+
+
+@pytest.mark.django_db(transaction=True)
+def test_writer_reads_own_comment_until_pin_expires(
+    author_client, news, settings, replicas
+):
+    url = reverse('news:detail', args=[news.pk])
+    response = author_client.post(url, data={'text': 'Свежий комментарий'})
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.using('default').filter(news=news).exists()
+    cookie = response.cookies[PIN_COOKIE]
+    assert cookie['max-age'] == settings.READ_YOUR_WRITES_SECONDS
+
+    response = author_client.get(url)
+    assert 'Свежий комментарий' in response.content.decode()
+
+    # Другие пользователи читают с отстающих реплик.
+    response = Client().get(url)
+    assert 'Свежий комментарий' not in response.content.decode()
+
+    # Кука истекла: автор тоже читает с реплик.
+    del author_client.cookies[PIN_COOKIE]
+    response = author_client.get(url)
+    assert 'Свежий комментарий' not in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_home_page_is_not_cached_from_lagging_replica(
+    client, news, settings, replicas
+):
+    settings.NEWS_HOME_CACHE_ENABLED = True
+    # Запись меняет поколение, но до реплик не доходит.
+    fresh = News.objects.create(title='Свежая новость', text='Текст')
+    for _ in range(2):
+        response = client.get(reverse('news:home'))
+        assert fresh.title in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_news_api_etag_matches_primary_data(client, news, replicas):
+    url = reverse('news:api_news')
+    etag = client.get(url)['ETag']
+    fresh = News.objects.create(title='Свежая новость', text='Текст')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert fresh.pk in [row['id'] for row in response.json()['results']]
@@ -0,0 +1,37 @@
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='PRAGMA есть только у SQLite.'
+)
+
+
+@pytest.fixture
+def new_connection(db):
+    new = connections.create_connection('default')
+    yield new
+    new.close()
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_new_connection_gets_pragma_profile(new_connection, settings):
+    with CaptureQueriesContext(new_connection) as context:
+        new_connection.ensure_connection()
+    assert len(context) == 0
+    pragmas = settings.SQLITE_PRAGMAS
+    assert pragma(new_connection, 'busy_timeout') == pragmas['busy_timeout']
+    assert pragma(new_connection, 'cache_size') == pragmas['cache_size']
+    # NORMAL и MEMORY.
+    assert pragma(new_connection, 'synchronous') == 1
+    assert pragma(new_connection, 'temp_store') == 2
+
+
+def test_pragma_profile_is_configurable(new_connection, settings):
+    settings.SQLITE_PRAGMAS = {'busy_timeout': 1234}
+    assert pragma(new_connection, 'busy_timeout') == 1234
@@ -0,0 +1,44 @@
+import importlib
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.template import engines
+
+from yanews.templating import warm_templates
+
+
+@pytest.fixture
+def prod_settings(monkeypatch):
+    """Профиль prod с секретным ключом из окружения."""
+    monkeypatch.setenv('DJANGO_SECRET_KEY', 'test-secret-key')
+    return importlib.import_module('yanews.settings.prod')
+
+
+def test_project_templates_compile(capsys):
+    call_command('check_templates')
+    assert 'Шаблоны в порядке' in capsys.readouterr().out
+
+
+def test_broken_template_fails_check(tmp_path, settings):
+    (tmp_path / 'broken.html').write_text('{% if %}', encoding='utf-8')
+    engine = settings.TEMPLATES[0]
+    settings.TEMPLATES = [{**engine, 'DIRS': [*engine['DIRS'], tmp_path]}]
+    with pytest.raises(CommandError, match='1 из'):
+        call_command('check_templates')
+
+
+def test_warm_templates_fills_cached_loader(settings, prod_settings):
+    settings.TEMPLATES = prod_settings.TEMPLATES
+    warm_templates()
+    loader = engines['django'].engine.template_loaders[0]
+    assert 'news/detail.html' in loader.get_template_cache
+    assert 'base.html' in loader.get_template_cache
+
+
+def test_prod_profile_requires_secret_key(monkeypatch):
+    monkeypatch.delenv('DJANGO_SECRET_KEY', raising=False)
+    monkeypatch.delitem(sys.modules, 'yanews.settings.prod', raising=False)
+    with pytest.raises(ImproperlyConfigured, match='DJANGO_SECRET_KEY'):
+        importlib.import_module('yanews.settings.prod')
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from .live import broker, comment_event
+from .models import Comment, News
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_pages(**kwargs):
+    """
+    Любое изменение новости или комментария сбрасывает кеш страниц.
+
+    bulk_create и QuerySet.update сигналов не отправляют, после них
+    кеш нужно сбрасывать вручную через bump_generation().
+    """
+    bump_generation()
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment(instance, created, **kwargs):
+    """
+    Новый комментарий уходит подписчикам потока новости.
+
+    Отправляется после фиксации транзакции, иначе клиент может получить
+    комментарий, которого в БД так и не окажется.
+    """
+    if created and broker.has_subscribers(instance.news_id):
+        transaction.on_commit(
+            lambda: broker.publish(instance.news_id, comment_event(instance))
+        )
+
+
+@receiver(connection_created)
+def configure_sqlite(connection, **kwargs):
+    """
+    Применяет SQLITE_PRAGMAS к каждому новому соединению с SQLite.
+
+    PRAGMA выполняются напрямую в sqlite3, минуя курсоры Django, и не
+    попадают в подсчёт запросов к БД.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
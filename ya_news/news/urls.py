@@ -1,16 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
-from news import views
+from news import api, views
 
 app_name = 'news'
 
+if settings.ASYNC_VIEWS:
+    news_list = views.news_list
+    news_detail = views.news_detail
+else:
+    news_list = views.NewsList.as_view()
+    news_detail = views.NewsDetailView.as_view()
+
 urlpatterns = [
-    path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('', news_list, name='home'),
+    path('news/<int:pk>/', news_detail, name='detail'),
+    path('news/<int:pk>/live/', views.CommentsLive.as_view(), name='live'),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete',
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path(
+        'news/<int:pk>/comments.<str:file_format>',
+        views.CommentsExport.as_view(),
+        name='export',
+    ),
+    path('api/news/', api.NewsListApi.as_view(), name='api_news'),
+    path(
+        'api/news/<int:pk>/comments/',
+        api.CommentsApi.as_view(),
+        name='api_comments',
+    ),
 ]
@@ -1,50 +1,208 @@
+import re
+from http import HTTPStatus
+
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+)
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.template.loader import get_template, render_to_string
 from django.urls import reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.safestring import mark_safe
 from django.views import generic
+from django.views.decorators.http import condition
+
+from yanews.offload import async_view
 
+from .cache import (
+    home_page_etag,
+    home_page_key,
+    news_etag,
+    news_last_modified,
+    thread_key,
+)
+from .export import (
+    COMMENT_HEADER,
+    FORMATS,
+    comment_rows,
+    export_response,
+)
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import comments_page
+
+
+class ConditionalGetMixin:
+    """
+    Отвечает 304 Not Modified, если у клиента актуальная страница.
+
+    ETag (и Last-Modified, если задан) вычисляется одним запросом до
+    рендеринга. Страница зависит от пользователя, поэтому ответ
+    получает Vary: Cookie, а для авторизованных ещё и private, чтобы
+    общие кеши его не хранили.
+    """
+
+    etag_func = None
+    last_modified_func = None
+
+    def dispatch(self, request, *args, **kwargs):
+        return conditional_get(
+            super().dispatch,
+            request,
+            *args,
+            etag_func=self.etag_func,
+            last_modified_func=self.last_modified_func,
+            **kwargs,
+        )
+
+
+def conditional_get(
+    view, request, *args, etag_func=None, last_modified_func=None, **kwargs
+):
+    """Вызывает view с проверкой условного GET, см. ConditionalGetMixin."""
+    view = condition(
+        etag_func=etag_func, last_modified_func=last_modified_func
+    )(view)
+    response = view(request, *args, **kwargs)
+    patch_vary_headers(response, ('Cookie',))
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True)
+    return response
 
 
-class NewsList(generic.ListView):
+class NewsList(ConditionalGetMixin, generic.ListView):
     """Список новостей."""
 
     model = News
+    etag_func = staticmethod(home_page_etag)
     template_name = 'news/home.html'
 
+    def get(self, request, *args, **kwargs):
+        """
+        Анонимным пользователям отдаём страницу из кеша.
+
+        Ключ зависит от поколения данных, поэтому любая запись новости
+        или комментария делает закешированную страницу недоступной.
+        """
+        if (
+            not settings.NEWS_HOME_CACHE_ENABLED
+            or request.user.is_authenticated
+        ):
+            return super().get(request, *args, **kwargs)
+        key = home_page_key()
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda rendered: cache.set(
+                key, rendered.content, settings.NEWS_HOME_CACHE_TIMEOUT
+            )
+        )
+        return response
+
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев хранится в самой новости, поэтому таблицу
+        комментариев не затрагиваем.
+
+        Читаем из основной БД: ключ кеша и ETag берутся из поколения,
+        а реплика могла ещё не получить запись, которая его сменила.
+        Страница с реплики закрепилась бы под новым поколением.
         """
-        return self.model.objects.prefetch_related('comment_set')[
+        return self.model.objects.using(DEFAULT_DB_ALIAS)[
             : settings.NEWS_COUNT_ON_HOME_PAGE
         ]
 
 
-class NewsDetail(generic.DetailView):
+# Метка на месте ссылок «Редактировать» и «Удалить»: id автора и id
+# комментария.
+CONTROLS = re.compile(r'<!--controls (\d+) (\d+)-->')
+
+
+class CommentsPageMixin:
+    """
+    Добавляет в контекст страницу комментариев новости.
+
+    Размер страницы определяется в настройках проекта, следующая
+    страница передаётся курсором в параметре after.
+
+    Отрисованная страница кешируется до следующей записи в ветке,
+    поэтому в контексте только её HTML (comments_html), без самих
+    комментариев. Ссылки автора на свои комментарии в кеш не попадают:
+    вместо них стоят метки, которые при каждом запросе заменяются
+    ссылками или удаляются.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        key = thread_key(self.object, self.request.GET.get('after'))
+        cached = cache.get(key)
+        if cached is None:
+            comments, next_cursor = comments_page(
+                self.object.comment_set.select_related('author'),
+                self.request.GET.get('after'),
+                settings.COMMENTS_COUNT_ON_NEWS_PAGE,
+            )
+            html = render_to_string(
+                'news/comments.html', {'comments': comments}
+            )
+            cached = html, next_cursor
+            cache.set(key, cached, settings.NEWS_THREAD_CACHE_TIMEOUT)
+        html, context['next_cursor'] = cached
+        context['comments_html'] = self.add_controls(html)
+        return context
+
+    def add_controls(self, html):
+        user_id = self.request.user.pk
+        controls = None
+
+        def replace(match):
+            nonlocal controls
+            author_id, pk = map(int, match.groups())
+            if author_id != user_id:
+                return ''
+            if controls is None:
+                controls = get_template('news/comment_controls.html')
+            return controls.render({'pk': pk})
+
+        return mark_safe(CONTROLS.sub(replace, html))
+
+
+class NewsDetail(ConditionalGetMixin, CommentsPageMixin, generic.DetailView):
     model = News
     template_name = 'news/detail.html'
+    etag_func = staticmethod(news_etag)
+    last_modified_func = staticmethod(news_last_modified)
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk'],
-        )
-        return obj
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
+        # Новые комментарии дописываются в конец последней страницы.
+        if settings.NEWS_LIVE_COMMENTS and not context['next_cursor']:
+            context['live_url'] = reverse(
+                'news:live', kwargs={'pk': self.object.pk}
+            )
         return context
 
 
 class NewsComment(
-    LoginRequiredMixin, generic.detail.SingleObjectMixin, generic.FormView
+    LoginRequiredMixin,
+    CommentsPageMixin,
+    generic.detail.SingleObjectMixin,
+    generic.FormView,
 ):
     model = News
     form_class = CommentForm
@@ -62,8 +220,10 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return (
+            reverse('news:detail', kwargs={'pk': self.object.pk})
+            + '#comments'
+        )
 
 
 class NewsDetailView(generic.View):
@@ -76,15 +236,28 @@ class NewsDetailView(generic.View):
         return view(request, *args, **kwargs)
 
 
+class CommentsLive(generic.View):
+    """
+    Адрес потока новых комментариев.
+
+    Сам поток отдаёт ASGI-приложение из news.live. Если запрос дошёл до
+    Django, сервер работает по WSGI, и ответ 204 велит EventSource
+    больше не переподключаться.
+    """
+
+    def get(self, request, pk):
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
+
+
 class CommentBase(LoginRequiredMixin):
     """Базовый класс для работы с комментариями."""
 
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """Комментарий уже загружен, новость для адреса не нужна."""
         return (
-            reverse('news:detail', kwargs={'pk': comment.news.pk})
+            reverse('news:detail', kwargs={'pk': self.object.news_id})
             + '#comments'
         )
 
@@ -104,3 +277,33 @@ class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
 
     template_name = 'news/delete.html'
+
+
+class CommentsExport(PermissionRequiredMixin, generic.View):
+    """
+    Выгрузка всех комментариев новости в CSV или JSON Lines.
+
+    Файл не собирается в памяти целиком, см. export_response.
+    """
+
+    permission_required = 'news.view_comment'
+
+    def get(self, request, pk, file_format):
+        if file_format not in FORMATS:
+            raise Http404
+        news = get_object_or_404(News.objects.only('pk'), pk=pk)
+        return export_response(
+            request,
+            file_format,
+            f'news-{news.pk}-comments',
+            COMMENT_HEADER,
+            comment_rows(news.pk),
+        )
+
+
+# Асинхронные варианты страниц чтения для ASGI, см. ASYNC_VIEWS. Даже
+# страница из кеша выполняется в пуле потоков: в Django 3.2 у кеша нет
+# асинхронного API, и обращение к memcached или файлам из цикла событий
+# остановило бы все остальные запросы.
+news_list = async_view(NewsList.as_view())
+news_detail = async_view(NewsDetailView.as_view())
@@ -9,8 +9,21 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings.prod')
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', '1')
+os.environ.setdefault('DJANGO_LIVE_COMMENTS', '1')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from news.live import with_live_comments  # noqa: E402
+
+# Поток комментариев обслуживается в обход Django, см. news.live.
+application = with_live_comments(django_application)
+
+if settings.WARM_TEMPLATES:
+    from yanews.templating import warm_templates
+
+    warm_templates()
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.deprecation import MiddlewareMixin
+
+from .routers import RoutingState, routing_state
+
+logger = logging.getLogger('yanews.queries')
+
+# Статистика запросов к БД текущего запроса к сайту. Переменная контекста
+# видна и в потоках, куда асинхронные представления выносят работу с БД.
+query_stats = ContextVar('query_stats', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем ему позволено."""
+
+
+class QueryStats:
+    """Считает запросы к БД и время их выполнения."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time += time.perf_counter() - start
+
+
+def count_query(execute, sql, params, many, context):
+    """Обёртка соединения: передаёт запрос статистике текущего запроса."""
+    stats = query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrument(connection, **kwargs):
+    """
+    Подключает count_query к соединению, один раз на всё время жизни.
+
+    Обёртка ставится первой: временные обёртки execute_wrapper снимаются
+    с конца списка и её не заденут.
+    """
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_query)
+
+
+class QueryBudgetMiddleware(MiddlewareMixin):
+    """
+    Считает запросы к БД для каждого запроса к сайту.
+
+    Число запросов и время в БД отдаются в заголовках X-DB-Queries
+    и X-DB-Time и пишутся в лог yanews.queries. Для имён маршрутов
+    из QUERY_BUDGETS проверяется бюджет: при превышении пишется
+    предупреждение, а с QUERY_BUDGET_STRICT выбрасывается исключение.
+
+    Работает и в синхронной, и в асинхронной цепочке: запросы считаются
+    в любом потоке, где представление обращается к БД.
+    """
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        # Соединения, открытые до загрузки middleware.
+        for connection in connections.all():
+            instrument(connection)
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        return self.check_budget(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        return self.check_budget(request, response, stats)
+
+    def check_budget(self, request, response, stats):
+        db_time_ms = stats.time * 1000
+        response['X-DB-Queries'] = stats.count
+        response['X-DB-Time'] = f'{db_time_ms:.2f}'
+
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        logger.info(
+            'view=%s method=%s status=%s queries=%d db_time_ms=%.2f',
+            view_name,
+            request.method,
+            response.status_code,
+            stats.count,
+            db_time_ms,
+            extra={
+                'view_name': view_name,
+                'queries': stats.count,
+                'db_time_ms': db_time_ms,
+            },
+        )
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and stats.count > budget:
+            message = (
+                f'{view_name}: {stats.count} запросов к БД '
+                f'при бюджете {budget}'
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """
+    Закрепляет пользователя за основной БД после записи.
+
+    Если запрос что-то записал, а реплики настроены, ответ ставит куку
+    на READ_YOUR_WRITES_SECONDS. Пока она жива, PrimaryReplicaRouter
+    читает для этого пользователя из default, и он видит свои изменения,
+    даже если реплики отстают.
+    """
+
+    cookie_name = 'use_primary'
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        state = RoutingState(pinned=self.cookie_name in request.COOKIES)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin(response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=self.cookie_name in request.COOKIES)
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin(response, state)
+
+    def pin(self, response, state):
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                self.cookie_name,
+                '1',
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
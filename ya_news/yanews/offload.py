@@ -0,0 +1,76 @@
+"""
+Синхронный код для асинхронных представлений.
+
+В Django 3.2 ORM работает только синхронно. Синхронное представление
+под ASGI Django выполняет в единственном общем потоке, и запросы ждут
+друг друга. Асинхронные представления выносят работу с БД в отдельный
+пул из ASYNC_VIEW_THREADS потоков: запросы выполняются параллельно,
+а число одновременных соединений с БД ограничено размером пула.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_VIEW_THREADS,
+            thread_name_prefix='yanews-sync',
+        )
+    return _executor
+
+
+def _call(func, args, kwargs):
+    # Как при обычном запросе: соединение, у которого истёк
+    # CONN_MAX_AGE или случилась ошибка, закрывается.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """
+    Выполняет func в пуле потоков и ждёт результат.
+
+    Переменные контекста (статистика запросов, состояние маршрутизации
+    БД) в потоке те же, что у вызывающей корутины.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, _call, func, args, kwargs)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_executor(), call
+    )
+
+
+def _render(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    # TemplateResponse отрисовывается лениво, уже в обработчике Django,
+    # а при отрисовке выполняются запросы к БД. Рисуем его здесь, в пуле.
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+async def run_view(view, request, *args, **kwargs):
+    """Выполняет синхронное представление в пуле потоков."""
+    return await run_sync(_render, view, request, *args, **kwargs)
+
+
+def async_view(view):
+    """Асинхронное представление, выполняющее view в пуле потоков."""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run_view(view, request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,74 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+@dataclass
+class RoutingState:
+    """Как маршрутизировать запросы к БД при обработке одного запроса."""
+
+    # Пользователь недавно писал: реплики могли ещё не получить его данные.
+    pinned: bool = False
+    # Текущий запрос уже что-то записал в основную БД.
+    wrote: bool = False
+
+
+# Состояние текущего запроса, его устанавливает ReadYourWritesMiddleware.
+# Вне запроса (команды, оболочка) состояния нет.
+routing_state = ContextVar('routing_state', default=None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Пишет в default, а читает с реплик из DATABASE_REPLICAS.
+
+    Реплику выбирает стратегия DATABASE_REPLICA_STRATEGY: round_robin —
+    по очереди, least_recently_used — ту, что дольше всех не читали.
+    Запросы закреплённого пользователя и запросы, которые уже что-то
+    записали, читают из default, чтобы видеть свои изменения.
+    """
+
+    def __init__(self):
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.last_used = {}
+
+    def choose_replica(self, replicas):
+        if settings.DATABASE_REPLICA_STRATEGY == 'least_recently_used':
+            with self.lock:
+                alias = min(
+                    replicas, key=lambda alias: self.last_used.get(alias, 0)
+                )
+                self.last_used[alias] = time.monotonic()
+            return alias
+        return replicas[next(self.counter) % len(replicas)]
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = routing_state.get()
+        if not replicas or state and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        return self.choose_replica(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схему, как и данные, реплики получают от основной БД.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
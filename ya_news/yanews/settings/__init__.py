@@ -0,0 +1,8 @@
+"""
+Настройки YaNews по окружениям.
+
+base — общие настройки, dev — для разработки, test — для тестов,
+prod — для продакшена. Профиль выбирается через DJANGO_SETTINGS_MODULE,
+например yanews.settings.prod; сам пакет yanews.settings — это dev.
+"""
+from .dev import *  # noqa: F401,F403
@@ -0,0 +1,203 @@
+import os
+from pathlib import Path
+
+from django.urls import reverse_lazy
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = (
+    'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'news.apps.NewsConfig',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # Раньше сессий и аутентификации: они тоже читают из БД.
+    'yanews.middleware.ReadYourWritesMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'yanews.middleware.QueryBudgetMiddleware',
+]
+
+ROOT_URLCONF = 'yanews.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны при запуске WSGI/ASGI-приложения. Имеет
+# смысл только с кеширующим загрузчиком, см. профиль prod.
+WARM_TEMPLATES = False
+
+WSGI_APPLICATION = 'yanews.wsgi.application'
+
+# Асинхронные представления главной и страницы новости; включает их
+# asgi.py. Работа с БД из них идёт в пуле из ASYNC_VIEW_THREADS потоков.
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS') == '1'
+ASYNC_VIEW_THREADS = int(os.getenv('DJANGO_ASYNC_VIEW_THREADS', '8'))
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+DATABASE_ROUTERS = ['yanews.routers.PrimaryReplicaRouter']
+
+# Псевдонимы из DATABASES, с которых читают представления; пока список
+# пуст, всё читается из default. Стратегия выбора реплики: round_robin
+# или least_recently_used.
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_STRATEGY = 'round_robin'
+# Сколько секунд после записи пользователь читает из default.
+READ_YOUR_WRITES_SECONDS = 5
+
+# PRAGMA для каждого нового соединения с SQLite, выполняются по порядку.
+# busy_timeout (мс) — сколько ждать блокировку вместо немедленной ошибки
+# «database is locked»; он идёт первым, потому что переключение журнала
+# тоже берёт блокировку. В режиме WAL чтение не ждёт записи,
+# а synchronous=NORMAL в этом режиме безопасен и не делает fsync на
+# каждую транзакцию.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    # Отрицательное значение задаёт размер в КиБ, а не в страницах.
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+# Для общего кеша между процессами укажите каталог в NEWS_CACHE_DIR,
+# иначе используется кеш в памяти процесса.
+NEWS_CACHE_DIR = os.getenv('NEWS_CACHE_DIR')
+
+if NEWS_CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': NEWS_CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+AUTH_PASSWORD_VALIDATORS = []
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_URL = reverse_lazy('users:login')
+LOGIN_REDIRECT_URL = reverse_lazy('news:home')
+
+NEWS_COUNT_ON_HOME_PAGE = 10
+COMMENTS_COUNT_ON_NEWS_PAGE = 50
+# Сколько новостей на странице JSON API.
+NEWS_API_PAGE_SIZE = 20
+
+# Поток новых комментариев (news.live) работает только под ASGI, его
+# включает asgi.py. Подписчику, у которого в очереди скопилось
+# NEWS_LIVE_QUEUE_SIZE событий, поток закрывается; после
+# NEWS_LIVE_KEEPALIVE секунд тишины клиенту уходит пустой комментарий SSE.
+NEWS_LIVE_COMMENTS = os.getenv('DJANGO_LIVE_COMMENTS') == '1'
+NEWS_LIVE_QUEUE_SIZE = 100
+NEWS_LIVE_KEEPALIVE = 15
+
+# Сколько строк читать из БД за раз при выгрузке комментариев.
+EXPORT_CHUNK_SIZE = 2000
+# Под ASGI выгрузка собирается во временном файле: до этого размера
+# в памяти, дальше на диске.
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Файл с дополнительными запрещёнными словами, по одному в строке.
+NEWS_BAD_WORDS_FILE = os.getenv('NEWS_BAD_WORDS_FILE')
+
+NEWS_HOME_CACHE_ENABLED = True
+NEWS_HOME_CACHE_TIMEOUT = 60 * 15
+# Страница комментариев новости хранится в кеше до записи в ветку,
+# но не дольше этого времени.
+NEWS_THREAD_CACHE_TIMEOUT = 60 * 15
+
+# Сколько запросов к БД может выполнить представление, вместе с загрузкой
+# сессии и пользователя. С QUERY_BUDGET_STRICT превышение вызывает ошибку,
+# иначе пишется предупреждение в лог yanews.queries.
+QUERY_BUDGETS = {
+    'news:home': 3,
+    'news:detail': 7,
+    'news:edit': 7,
+    'news:delete': 7,
+    # Под WSGI строки выгрузки читаются при отправке, уже после проверки
+    # бюджета, и не считаются; под ASGI файл собирается в представлении.
+    'news:export': 6,
+    'news:api_news': 1,
+    'news:api_comments': 2,
+}
+QUERY_BUDGET_STRICT = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yanews.queries': {
+            'handlers': ['console'],
+            'level': os.getenv('QUERY_LOG_LEVEL', 'WARNING'),
+        },
+        # Отчёт о прогреве шаблонов виден с TEMPLATE_LOG_LEVEL=INFO.
+        'yanews.templates': {
+            'handlers': ['console'],
+            'level': os.getenv('TEMPLATE_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
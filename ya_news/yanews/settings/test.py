@@ -0,0 +1,24 @@
+"""
+Настройки для тестов.
+
+Пароли хешируются самым быстрым алгоритмом, БД и кеш живут в памяти,
+а превышение бюджета запросов роняет тест.
+"""
+from .base import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+QUERY_BUDGET_STRICT = True
@@ -0,0 +1,62 @@
+"""
+Создание заметок через форму: транслитерация с кешем и без.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.note_create
+"""
+import time
+
+from .base import setup_django, test_database
+
+NOTES_COUNT = 2_000
+TITLES_COUNT = 50
+
+
+def create_notes(author, clear_cache):
+    from notes.forms import NoteForm
+    from notes.translit import slug_cache_stats, slugify_title
+
+    translit_calls = 0
+    start = time.perf_counter()
+    for index in range(NOTES_COUNT):
+        if clear_cache:
+            translit_calls += slug_cache_stats()['misses']
+            slugify_title.cache_clear()
+        form = NoteForm(
+            data={
+                'title': f'Заголовок заметки номер {index % TITLES_COUNT}',
+                'text': 'Текст',
+                'slug': '',
+            }
+        )
+        assert form.is_valid(), form.errors
+        note = form.save(commit=False)
+        note.author = author
+        note.save()
+    elapsed = time.perf_counter() - start
+    translit_calls += slug_cache_stats()['misses']
+    return elapsed / NOTES_COUNT * 1000, translit_calls
+
+
+def main():
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from notes.models import Note
+    from notes.translit import slugify_title
+
+    with test_database():
+        author = get_user_model().objects.create(username='Бенчмарк')
+        print(f'заметок: {NOTES_COUNT}, разных заголовков: {TITLES_COUNT}')
+        for title, clear_cache in (('без кеша', True), ('с кешем', False)):
+            Note.objects.all().delete()
+            slugify_title.cache_clear()
+            per_note, translit_calls = create_notes(author, clear_cache)
+            print(
+                f'{title:10} {per_note:6.3f} мс на заметку, '
+                f'транслитераций: {translit_calls}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Список заметок: время ответа при росте числа заметок пользователя.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.notes_list
+"""
+import time
+
+from .base import setup_django, test_database
+
+NOTES_COUNTS = (100, 1_000, 10_000, 50_000)
+BATCH_SIZE = 5_000
+REPEATS = 20
+
+
+def average_ms(func):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    with test_database():
+        author = get_user_model().objects.create(username='Бенчмарк')
+        client = Client()
+        client.force_login(author)
+        url = reverse('notes:list')
+        print('заметок   первая страница, мс   последняя страница, мс')
+        for count in NOTES_COUNTS:
+            existing = Note.objects.count()
+            Note.objects.bulk_create(
+                (
+                    Note(
+                        title=f'Заметка {index}',
+                        text='Текст заметки',
+                        slug=f'note-{index}',
+                        author=author,
+                    )
+                    for index in range(existing, count)
+                ),
+                batch_size=BATCH_SIZE,
+            )
+            last_page = (
+                Note.objects.order_by('-id').values_list('id', flat=True)[1]
+            )
+            first_ms = average_ms(lambda: client.get(url))
+            last_ms = average_ms(lambda: client.get(url, {'after': last_page}))
+            print(f'{count:7d}   {first_ms:20.2f}   {last_ms:21.2f}')
+
+
+if __name__ == '__main__':
+    main()
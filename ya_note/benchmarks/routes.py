@@ -0,0 +1,137 @@
+"""
+Задержки и пропускная способность всех маршрутов notes/urls.py.
+
+Каждый маршрут измеряется через тестовый клиент Django и напрямую
+через WSGI-приложение yanote.wsgi. Результаты сохраняются в JSON,
+с --baseline сравниваются с прошлым прогоном.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.routes --output before.json
+    python -m benchmarks.routes --baseline before.json --threshold 0.2
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from .base import (
+    client_get,
+    compare,
+    measure,
+    save_results,
+    setup_django,
+    test_database,
+    wsgi_get,
+)
+
+BATCH_SIZE = 5_000
+
+# Маршрут: аргументы для reverse и нужен ли вход автора заметки.
+ROUTES = {
+    'home': (lambda data: {}, False),
+    'add': (lambda data: {}, True),
+    'edit': (lambda data: {'slug': data['slug']}, True),
+    'detail': (lambda data: {'slug': data['slug']}, True),
+    'delete': (lambda data: {'slug': data['slug']}, True),
+    'list': (lambda data: {}, True),
+    'export': (lambda data: {'file_format': 'csv'}, True),
+    'success': (lambda data: {}, True),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--notes', type=int, default=50_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--output', help='Куда сохранить результаты.')
+    parser.add_argument('--baseline', help='Результаты для сравнения.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='Допустимый рост p50, доля (0.2 = 20%%).',
+    )
+    return parser.parse_args()
+
+
+def seed(users, notes):
+    from django.contrib.auth import get_user_model
+
+    from notes.models import Note
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{index}') for index in range(users)
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    Note.objects.bulk_create(
+        (
+            Note(
+                title=f'Заметка {index}',
+                text='Текст заметки. ' * 20,
+                slug=f'note-{index}',
+                author_id=user_ids[index % users],
+            )
+            for index in range(notes)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    note = Note.objects.select_related('author').get(slug='note-0')
+    return {'slug': note.slug, 'author': note.author}
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes import urls
+    from yanote.wsgi import application
+
+    names = {pattern.name for pattern in urls.urlpatterns}
+    if names != set(ROUTES):
+        sys.exit(f'Нет настроек для маршрутов: {names - set(ROUTES)}')
+
+    with test_database():
+        data = seed(args.users, args.notes)
+        anonymous = Client()
+        author = Client()
+        author.force_login(data['author'])
+        author_cookies = '; '.join(
+            f'{name}={morsel.value}' for name, morsel in author.cookies.items()
+        )
+        results = {}
+        for name, (kwargs, login) in ROUTES.items():
+            url = reverse(f'notes:{name}', kwargs=kwargs(data))
+            client = author if login else anonymous
+            cookies = author_cookies if login else ''
+            results[f'client:notes:{name}'] = measure(
+                lambda: client_get(client, url), args.requests
+            )
+            results[f'wsgi:notes:{name}'] = measure(
+                lambda: wsgi_get(application, url, cookies), args.requests
+            )
+
+    for name, result in results.items():
+        print(
+            f'{name:24} p50 {result["p50_ms"]:8.2f}  '
+            f'p90 {result["p90_ms"]:8.2f}  p99 {result["p99_ms"]:8.2f} мс  '
+            f'{result["rps"]:8.1f} запросов/с'
+        )
+    if args.output:
+        meta = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'users': args.users,
+            'notes': args.notes,
+            'requests': args.requests,
+        }
+        save_results(args.output, results, meta)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            sys.exit(f'Регрессии: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Накладные расходы на шаблоны: обычный загрузчик против кеширующего.
+
+Запуск из каталога ya_note:
+    python -m benchmarks.templates
+"""
+import os
+
+from .base import measure, setup_django, test_database
+
+REQUESTS = 300
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from notes.models import Note
+    # Нужен только список загрузчиков шаблонов из профиля prod.
+    os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark')
+    from yanote.settings import prod as prod_settings
+    from yanote.templating import warm_templates
+
+    # Без кеширующего загрузчика шаблоны компилируются при каждом запросе.
+    uncached = [
+        {
+            **settings.TEMPLATES[0],
+            'OPTIONS': {**settings.TEMPLATES[0]['OPTIONS'], 'debug': True},
+        }
+    ]
+    profiles = {
+        'без кеша шаблонов': uncached,
+        'кеширующий загрузчик': prod_settings.TEMPLATES,
+    }
+    with test_database():
+        author = get_user_model().objects.create(username='Бенчмарк')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Текст',
+                slug=f'note-{index}',
+                author=author,
+            )
+            for index in range(settings.NOTES_PAGE_SIZE)
+        )
+        urls = {
+            'список': reverse('notes:list'),
+            'заметка': reverse('notes:detail', args=['note-0']),
+        }
+        results = {}
+        for profile, templates in profiles.items():
+            with override_settings(TEMPLATES=templates):
+                warm_templates()
+                client = Client()
+                client.force_login(author)
+                for page, url in urls.items():
+                    results[profile, page] = measure(
+                        lambda: client.get(url), REQUESTS
+                    )
+        for page in urls:
+            plain = results['без кеша шаблонов', page]['p50_ms']
+            cached = results['кеширующий загрузчик', page]['p50_ms']
+            print(
+                f'{page}: p50 {plain:.2f} -> {cached:.2f} мс, '
+                f'на шаблоны уходило {plain - cached:.2f} мс'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from yanote.templating import compile_templates
+
+
+class Command(BaseCommand):
+    help = 'Проверяет, что все шаблоны проекта компилируются.'
+
+    def handle(self, *args, **options):
+        count, errors = compile_templates()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(
+                f'Не компилируются шаблоны: {len(errors)} из {count}.'
+            )
+        if options['verbosity']:
+            self.stdout.write(f'Шаблоны в порядке: {count}.')
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.export import FORMATS, export_lines, note_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Выгружает все заметки пользователя в CSV или JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        author_id = (
+            User.objects.filter(username=options['username'])
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if author_id is None:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден.'
+            )
+        lines = export_lines(options['format'], note_rows(author_id))
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as file:
+            file.writelines(lines)
@@ -0,0 +1,126 @@
+import time
+from contextlib import nullcontext
+from multiprocessing import Lock, Pool
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from notes.models import Note
+
+User = get_user_model()
+
+SEED_USER_PREFIX = 'seed-user-'
+
+# SQLite допускает только одного писателя: процессы параллельно готовят
+# строки, а вставляют их по очереди, иначе ловят «database is locked».
+write_lock = None
+
+
+def init_worker(lock):
+    """Запоминает в дочернем процессе общую блокировку записи."""
+    global write_lock
+    write_lock = lock
+
+
+def insert_notes(task):
+    """Вставляет заметки с номерами из [start, stop) пачками."""
+    start, stop, title, slug, user_ids, batch_size = task
+    for batch_start in range(start, stop, batch_size):
+        batch_stop = min(batch_start + batch_size, stop)
+        rows = [
+            Note(
+                title=f'{title} {number}',
+                text='Текст заметки. ' * 20,
+                slug=f'{slug}-{number}',
+                author_id=user_ids[number % len(user_ids)],
+            )
+            for number in range(batch_start, batch_stop)
+        ]
+        with write_lock or nullcontext():
+            Note.objects.bulk_create(rows)
+    return stop - start
+
+
+class Command(BaseCommand):
+    help = 'Создаёт синтетические заметки и пользователей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--notes', type=int, default=100_000)
+        parser.add_argument(
+            '--title',
+            default='Заметка',
+            help='Заголовки заметок: «<title> N».',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5_000,
+            help='Сколько строк вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Сколько процессов создают заметки.',
+        )
+
+    def report(self, label, rows, started):
+        if not self.verbosity:
+            return
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label}: {rows} за {elapsed:.1f} с '
+            f'({rows / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        batch_size = options['batch_size']
+
+        started = time.perf_counter()
+        first_user = User.objects.count()
+        User.objects.bulk_create(
+            (
+                User(username=f'{SEED_USER_PREFIX}{index}')
+                for index in range(first_user, first_user + options['users'])
+            ),
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        # Имена могли быть заняты, и такие строки пропущены.
+        self.report('Пользователи', User.objects.count() - first_user, started)
+        # Синтетические данные не приписываем настоящим пользователям.
+        user_ids = list(
+            User.objects.filter(
+                username__startswith=SEED_USER_PREFIX
+            ).values_list('pk', flat=True)
+        )
+        if not user_ids:
+            return
+
+        # Заметка «<title> N» получает slug <slug>-N, как и при обычном
+        # сохранении. Номера продолжают уже занятые, поэтому slug
+        # уникальны без запроса на каждую заметку.
+        started = time.perf_counter()
+        title = options['title']
+        slug = Note.title_slug(title)
+        first = Note.last_slug_number(slug) + 1
+        stop = first + options['notes']
+        workers = max(1, options['workers'])
+        step = -(-options['notes'] // workers) or 1
+        tasks = [
+            (start, min(start + step, stop), title, slug, user_ids, batch_size)
+            for start in range(first, stop, step)
+        ]
+        if workers == 1:
+            created = sum(map(insert_notes, tasks))
+        else:
+            # Дочерние процессы открывают собственные соединения с БД.
+            connections.close_all()
+            sqlite = connections['default'].vendor == 'sqlite'
+            lock = Lock() if sqlite else None
+            with Pool(workers, init_worker, (lock,)) as pool:
+                created = sum(pool.map(insert_notes, tasks))
+        self.report('Заметки', created, started)
@@ -1,7 +1,31 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, IntegerField, Max, Min, Q
+from django.db.models.functions import Cast, Substr
 
-from pytils.translit import slugify
+from .translit import slugify_title
+
+# Сколько раз пробуем сохранить заметку, если свободный slug успели занять.
+SLUG_ATTEMPTS = 5
+# Место под суффикс -N в конце slug, сгенерированного из заголовка.
+SLUG_SUFFIX_LENGTH = 10
+
+
+@models.CharField.register_lookup
+class Glob(models.Lookup):
+    """
+    Сравнение с шаблоном GLOB в SQLite.
+
+    В отличие от __regex, которое SQLite выполняет функцией на Python,
+    GLOB встроен в SQLite и не замедляет просмотр длинного диапазона.
+    """
+
+    lookup_name = 'glob'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} GLOB {rhs}', [*lhs_params, *rhs_params]
 
 
 class Note(models.Model):
@@ -27,11 +51,101 @@ class Note(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Пустой slug заполняется из заголовка.
+
+        Если такой slug уже занят, добавляем к нему свободный номер.
+        Номер может оказаться занят: его успел взять другой запрос или
+        в нумерации есть пропуски. Тогда подбираем его заново, уже точно.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = self.free_slug(exact=attempt > 0)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                self.slug = ''
+                if attempt == SLUG_ATTEMPTS - 1:
+                    raise
+
+    def free_slug(self, exact=False):
+        """
+        Свободный slug для заголовка заметки: slug или slug-N.
+
+        Без пропусков в нумерации следующий номер равен числу занятых
+        адресов, поэтому достаточно посчитать записи индекса одним
+        запросом. Это только догадка: в диапазон могут попасть и
+        slug-2024-plan, и тогда номер окажется занят. С exact=True
+        берётся наименьший свободный номер среди slug-N, это дороже.
+        """
+        slug = self.title_slug(self.title)
+        if not exact:
+            found = self.index_range(slug).exclude(pk=self.pk).aggregate(
+                count=Count('*'), first=Min('slug')
+            )
+            if found['first'] != slug:
+                return slug
+            return f'{slug}-{found["count"]}'
+        taken = self.slug_range(slug).exclude(pk=self.pk)
+        if not taken.filter(slug=slug).exists():
+            return slug
+        # Для самого slug номер 0. Ищем наименьший номер, следующий
+        # за которым не занят.
+        numbers = taken.annotate(
+            number=Cast(Substr('slug', len(slug) + 2), IntegerField()),
+            following=F('number') + 1,
+        )
+        free = numbers.exclude(
+            following__in=numbers.values('number')
+        ).aggregate(free=Min('following'))['free']
+        return f'{slug}-{free}'
+
+    @classmethod
+    def title_slug(cls, title):
+        """Slug из заголовка, с местом под суффикс -N."""
+        max_slug_length = cls._meta.get_field('slug').max_length
+        slug_length = max_slug_length - SLUG_SUFFIX_LENGTH
+        # Обрезка может прийтись на дефис, и тогда получилось бы «…--1».
+        return slugify_title(title)[:slug_length].rstrip('-') or 'note'
+
+    @classmethod
+    def index_range(cls, slug):
+        """
+        Заметки со slug или slug-<цифра>... по уникальному индексу.
+
+        Из допустимых в slug символов меньше ':' только '-' и цифры,
+        поэтому slug-o-kotah в диапазон не попадает.
+        """
+        return cls.objects.filter(slug__gte=slug, slug__lt=f'{slug}-:')
+
+    @classmethod
+    def slug_range(cls, slug):
+        """
+        Заметки со slug или slug-N, где N — число без ведущих нулей.
+
+        GLOB проверяет каждую запись диапазона, поэтому быстрый путь
+        free_slug обходится без него.
+        """
+        numbered = Q(slug__glob=f'{slug}-[1-9]*') & ~Q(
+            slug__glob=f'{slug}-*[^0-9]*'
+        )
+        return cls.index_range(slug).filter(Q(slug=slug) | numbered)
+
+    @classmethod
+    def last_slug_number(cls, slug):
+        """Наибольший занятый номер N среди slug-N, 0 если их нет."""
+        last = cls.slug_range(slug).aggregate(
+            last=Max(Cast(Substr('slug', len(slug) + 2), IntegerField()))
+        )['last']
+        return last or 0
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(connection, **kwargs):
+    """
+    Применяет SQLITE_PRAGMAS к каждому новому соединению с SQLite.
+
+    PRAGMA выполняются напрямую в sqlite3, минуя курсоры Django, и не
+    попадают в подсчёт запросов к БД.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,177 @@
+import csv
+import importlib
+from http import HTTPStatus
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import clear_url_caches, reverse
+
+import notes.urls
+import yanote.urls
+from notes.models import Note
+
+User = get_user_model()
+
+
+def asgi_get(path, client=None):
+    """
+    GET-запрос к ASGI-приложению, как его вызывает сервер.
+
+    В отличие от AsyncClient, тело ответа читается самим обработчиком
+    ASGI, в цикле событий. Возвращает статус, заголовки и тело.
+    """
+    cookies = '; '.join(
+        f'{name}={morsel.value}'
+        for name, morsel in (client.cookies.items() if client else ())
+    )
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookies.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def call():
+        await get_asgi_application()(scope, receive, send)
+
+    async_to_sync(call)()
+    start, *body = messages
+    headers = {
+        name.decode().lower(): value.decode()
+        for name, value in start['headers']
+    }
+    content = b''.join(message.get('body', b'') for message in body)
+    return start['status'], headers, content
+
+
+def reload_urls():
+    importlib.reload(notes.urls)
+    importlib.reload(yanote.urls)
+    clear_url_caches()
+
+
+# Асинхронные представления работают с БД из других потоков, которые
+# не видят данных незавершённой транзакции TestCase.
+class TestAsyncViews(TransactionTestCase):
+    """Асинхронные представления, которые включает asgi.py."""
+
+    def setUp(self):
+        settings = override_settings(ASYNC_VIEWS=True)
+        settings.enable()
+        reload_urls()
+        self.addCleanup(reload_urls)
+        self.addCleanup(settings.disable)
+
+        self.author = User.objects.create(username='Хоппер')
+        self.note = Note.objects.create(
+            title='Заголовок', text='Текст', author=self.author
+        )
+        self.async_client.force_login(self.author)
+
+    async def test_notes_list(self):
+        response = await self.async_client.get(reverse('notes:list'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(self.note, response.context['object_list'])
+        # Сессия, пользователь и заметки, посчитанные в пуле потоков.
+        self.assertEqual(response['X-DB-Queries'], '3')
+
+    async def test_note_detail(self):
+        response = await self.async_client.get(
+            reverse('notes:detail', args=[self.note.slug])
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, self.note.text)
+
+    async def test_anonymous_user_is_redirected(self):
+        client = self.async_client_class()
+        response = await client.get(reverse('notes:list'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestRoutesUnderAsgi(TransactionTestCase):
+    """Все маршруты проекта под ASGI с асинхронными представлениями."""
+
+    # Маршрут: нужен ли вход автора заметки и ожидаемый статус ответа.
+    ROUTES = {
+        'notes:home': (False, HTTPStatus.OK),
+        'notes:add': (True, HTTPStatus.OK),
+        'notes:edit': (True, HTTPStatus.OK),
+        'notes:detail': (True, HTTPStatus.OK),
+        'notes:delete': (True, HTTPStatus.OK),
+        'notes:list': (True, HTTPStatus.OK),
+        'notes:export': (True, HTTPStatus.OK),
+        'notes:success': (True, HTTPStatus.OK),
+        'users:login': (False, HTTPStatus.OK),
+        'users:signup': (False, HTTPStatus.OK),
+        'users:logout': (False, HTTPStatus.OK),
+        'admin:index': (True, HTTPStatus.FOUND),
+    }
+
+    def setUp(self):
+        settings = override_settings(ASYNC_VIEWS=True)
+        settings.enable()
+        reload_urls()
+        self.addCleanup(reload_urls)
+        self.addCleanup(settings.disable)
+
+    def test_every_route_is_checked(self):
+        names = {f'notes:{pattern.name}' for pattern in notes.urls.urlpatterns}
+        self.assertEqual(names - set(self.ROUTES), set())
+
+    def test_routes(self):
+        author = User.objects.create(username='Хоппер')
+        note = Note.objects.create(
+            title='Заголовок', text='Текст', author=author
+        )
+        author_client = Client()
+        author_client.force_login(author)
+        arguments = {
+            'notes:edit': (note.slug,),
+            'notes:detail': (note.slug,),
+            'notes:delete': (note.slug,),
+            'notes:export': ('csv',),
+        }
+        for name, (login, expected) in self.ROUTES.items():
+            with self.subTest(name=name):
+                status, _, _ = asgi_get(
+                    reverse(name, args=arguments.get(name, ())),
+                    author_client if login else None,
+                )
+                self.assertEqual(status, expected)
+
+
+class TestExportUnderAsgi(TransactionTestCase):
+    """Выгрузка под ASGI, где потоковый ответ читается в цикле событий."""
+
+    def test_export_is_complete(self):
+        author = User.objects.create(username='Архивариус')
+        note = Note.objects.create(
+            title='Заголовок', text='Текст', author=author
+        )
+        client = Client()
+        client.force_login(author)
+        status, headers, content = asgi_get(
+            reverse('notes:export', args=('csv',)), client
+        )
+        self.assertEqual(status, HTTPStatus.OK)
+        # Строки прочитаны в представлении и учтены в бюджете запросов.
+        self.assertEqual(headers['x-db-queries'], '3')
+        self.assertEqual(
+            headers['content-disposition'], 'attachment; filename="notes.csv"'
+        )
+        rows = list(csv.DictReader(StringIO(content.decode())))
+        self.assertEqual([row['slug'] for row in rows], [note.slug])
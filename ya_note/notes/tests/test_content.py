@@ -1,7 +1,12 @@
+import csv
+import json
+import tracemalloc
 from http import HTTPStatus
+from io import StringIO
 
+from django.core.management import call_command
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 
 from notes.models import Note
@@ -45,6 +50,51 @@ class TestContent(TestCase):
         self.assertNotIn(self.note, object_list)
 
 
+@override_settings(NOTES_PAGE_SIZE=2)
+class TestNotesListPages(TestCase):
+    LIST_URL = reverse('notes:list')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Кнут')
+        cls.notes = [
+            Note.objects.create(
+                title=f'Том {index}', text='Текст', author=cls.author
+            )
+            for index in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_pages_cover_all_notes_in_order(self):
+        shown = []
+        params = {}
+        for _ in range(3):
+            response = self.client.get(self.LIST_URL, params)
+            page = response.context['object_list']
+            self.assertLessEqual(len(page), 2)
+            shown.extend(page)
+            next_cursor = response.context['next_cursor']
+            params = {'after': next_cursor}
+        self.assertIsNone(next_cursor)
+        self.assertEqual(shown, self.notes)
+
+    def test_invalid_cursor_shows_first_page(self):
+        for after in ('²', '9' * 30, '-1', 'мусор'):
+            with self.subTest(after=after):
+                response = self.client.get(self.LIST_URL, {'after': after})
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(
+                    list(response.context['object_list']), self.notes[:2]
+                )
+
+    def test_page_loads_only_listed_fields(self):
+        response = self.client.get(self.LIST_URL)
+        for note in response.context['object_list']:
+            self.assertEqual(note.get_deferred_fields(), {'text', 'author_id'})
+
+
 class TestEditNote(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -80,3 +130,78 @@ class TestAddNote(TestCase):
         self.assertIn('form', response.context)
         form = response.context['form']
         self.assertTrue(isinstance(form, NoteForm))
+
+
+@override_settings(EXPORT_CHUNK_SIZE=500)
+class TestNotesExport(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Архивариус')
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст,\nв две строки', author=cls.author
+        )
+        Note.objects.create(
+            title='Чужая', text='Текст', author=User.objects.create()
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def export(self, file_format):
+        response = self.client.get(
+            reverse('notes:export', args=(file_format,))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_only_own_notes_are_exported(self):
+        expected = {
+            'id': self.note.id,
+            'title': self.note.title,
+            'slug': self.note.slug,
+            'text': self.note.text,
+        }
+        rows = list(csv.DictReader(StringIO(self.export('csv'))))
+        self.assertEqual(rows, [{**expected, 'id': str(self.note.id)}])
+        rows = [json.loads(line) for line in self.export('jsonl').splitlines()]
+        self.assertEqual(rows, [expected])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('notes:export', args=('xml',)))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_export_notes_command(self):
+        output = StringIO()
+        call_command('export_notes', self.author.username, stdout=output)
+        output.seek(0)
+        rows = list(csv.DictReader(output))
+        self.assertEqual([row['text'] for row in rows], [self.note.text])
+
+    def test_memory_does_not_grow_with_notes(self):
+        """
+        Пиковая память выгрузки не зависит от числа заметок.
+
+        Здесь 2 и 20 тысяч заметок; на миллионе поведение то же.
+        """
+        peaks = []
+        for count in (2_000, 20_000):
+            author = User.objects.create(username=f'Автор {count}')
+            Note.objects.bulk_create(
+                Note(
+                    title='Заметка',
+                    text='Текст заметки ' * 5,
+                    slug=f'{count}-{index}',
+                    author=author,
+                )
+                for index in range(count)
+            )
+            self.client.force_login(author)
+            tracemalloc.start()
+            response = self.client.get(reverse('notes:export', args=('csv',)))
+            lines = sum(1 for _ in response.streaming_content)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.assertEqual(lines, count + 1)
+            peaks.append(peak)
+        self.assertLess(peaks[1], peaks[0] * 1.5)
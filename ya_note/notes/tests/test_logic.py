@@ -1,12 +1,15 @@
+import time
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import Client, TestCase
 from django.urls import reverse
 from pytils.translit import slugify
 
-from notes.models import Note
+from notes.models import SLUG_SUFFIX_LENGTH, Note
 from notes.forms import WARNING
+from notes.translit import slug_cache_stats, slugify_title
 
 
 User = get_user_model()
@@ -156,3 +159,121 @@ class NoteCreationTestCase(TestCase):
         new_note = Note.objects.latest('id')
         expected_slug = slugify(form_data['title'])
         self.assertEqual(new_note.slug, expected_slug)
+
+
+class SlugSuffixTestCase(TestCase):
+    NOTE_TITLE = 'Одинаковый заголовок'
+    NOTES_COUNT = 10_000
+    TIME_BUDGET = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.slug = slugify(cls.NOTE_TITLE)
+
+    def create_note(self, title=NOTE_TITLE):
+        note = Note(title=title, text='Текст', author=self.author)
+        note.save()
+        return note
+
+    def test_duplicate_titles_get_numbered_slugs(self):
+        slugs = [self.create_note().slug for _ in range(3)]
+        self.assertEqual(
+            slugs, [self.slug, f'{self.slug}-1', f'{self.slug}-2']
+        )
+
+    def test_taken_guess_falls_back_to_exact_number(self):
+        notes = [self.create_note() for _ in range(3)]
+        notes[1].delete()
+        self.assertEqual(self.create_note().slug, f'{self.slug}-1')
+
+    def test_freed_slug_is_reused(self):
+        notes = [self.create_note() for _ in range(2)]
+        notes[0].delete()
+        self.assertEqual(self.create_note().slug, self.slug)
+
+    def test_numbering_fills_gaps_and_ignores_other_suffixes(self):
+        notes = [self.create_note() for _ in range(4)]
+        notes[2].delete()
+        for suffix in ('book', '2-book', '02'):
+            Note.objects.create(
+                title='Другая',
+                text='Текст',
+                slug=f'{self.slug}-{suffix}',
+                author=self.author,
+            )
+        note = Note(title=self.NOTE_TITLE, author=self.author)
+        self.assertEqual(note.free_slug(exact=True), f'{self.slug}-2')
+
+    def test_longer_title_does_not_take_number(self):
+        self.create_note(f'{self.NOTE_TITLE} о котах')
+        slugs = [self.create_note().slug for _ in range(2)]
+        self.assertEqual(slugs, [self.slug, f'{self.slug}-1'])
+
+    def test_numbered_title_does_not_shift_numbering(self):
+        self.create_note()
+        self.create_note(f'{self.NOTE_TITLE} 2024')
+        note = Note(title=self.NOTE_TITLE, author=self.author)
+        self.assertEqual(note.free_slug(exact=True), f'{self.slug}-1')
+
+    def test_truncated_slug_has_no_double_hyphen(self):
+        slug_length = (
+            Note._meta.get_field('slug').max_length - SLUG_SUFFIX_LENGTH
+        )
+        title = 'а' * (slug_length - 1) + ' бв'
+        notes = [self.create_note(title) for _ in range(2)]
+        self.assertFalse(notes[0].slug.endswith('-'))
+        self.assertNotIn('--', notes[1].slug)
+
+    def test_form_with_empty_slug_gets_numbered_slug(self):
+        self.create_note()
+        self.client.force_login(self.author)
+        response = self.client.post(
+            reverse('notes:add'),
+            data={'title': self.NOTE_TITLE, 'text': 'Текст', 'slug': ''},
+        )
+        self.assertRedirects(response, '/done/')
+        self.assertTrue(Note.objects.filter(slug=f'{self.slug}-1').exists())
+
+    def test_long_title_slug_fits_field(self):
+        max_length = Note._meta.get_field('slug').max_length
+        title = 'а' * max_length
+        notes = [self.create_note(title) for _ in range(2)]
+        for note in notes:
+            self.assertLessEqual(len(note.slug), max_length)
+        self.assertNotEqual(notes[0].slug, notes[1].slug)
+
+    def test_repeated_title_is_transliterated_once(self):
+        slugify_title.cache_clear()
+        for _ in range(3):
+            self.create_note()
+        stats = slug_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_many_identical_titles_within_time_budget(self):
+        start = time.perf_counter()
+        for _ in range(self.NOTES_COUNT):
+            self.create_note()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(
+            Note.objects.values('slug').distinct().count(), self.NOTES_COUNT
+        )
+        self.assertLess(elapsed, self.TIME_BUDGET)
+
+
+class SeedNotesTestCase(TestCase):
+    def test_seeded_slugs_are_unique_and_follow_titles(self):
+        author = User.objects.create(username='Автор')
+        existing = Note.objects.create(
+            title='Заметка 2', text='Текст', author=author
+        )
+        call_command(
+            'seed_notes', users=2, notes=25, batch_size=4, verbosity=0
+        )
+        seeded = Note.objects.exclude(pk=existing.pk)
+        self.assertEqual(seeded.count(), 25)
+        self.assertEqual(Note.objects.values('slug').distinct().count(), 26)
+        for note in seeded:
+            self.assertEqual(note.slug, slugify(note.title))
+        self.assertFalse(seeded.filter(author=author).exists())
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from yanote.middleware import QueryBudgetExceeded
+
+User = get_user_model()
+
+
+class TestQueryBudget(TestCase):
+    LIST_URL = reverse('notes:list')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Дейкстра')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def test_query_stats_in_headers(self):
+        response = self.client.get(self.LIST_URL)
+        # Сессия, пользователь и заметки.
+        self.assertEqual(response['X-DB-Queries'], '3')
+        self.assertGreaterEqual(float(response['X-DB-Time']), 0)
+
+    @override_settings(QUERY_BUDGETS={'notes:list': 1})
+    def test_budget_violation_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.LIST_URL)
+
+    @override_settings(
+        QUERY_BUDGETS={'notes:list': 1}, QUERY_BUDGET_STRICT=False
+    )
+    def test_budget_violation_logged_otherwise(self):
+        with self.assertLogs('yanote.queries', 'WARNING') as logs:
+            self.client.get(self.LIST_URL)
+        self.assertIn(
+            'notes:list: 3 запросов к БД при бюджете 1', logs.output[0]
+        )
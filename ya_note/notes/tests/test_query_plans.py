@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+@skipUnless(
+    connection.vendor == 'sqlite', 'Планы запросов проверяются для SQLite.'
+)
+class TestQueryPlans(TestCase):
+    """Запросы страниц заметок не должны просматривать таблицы целиком."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Кодд')
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', slug='plan', author=cls.author
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    @contextmanager
+    def assertNoFullScans(self):
+        """
+        Проверяет планы SELECT-запросов, выполненных внутри блока.
+
+        Полный просмотр таблицы или сортировка во временном B-дереве
+        означают, что запросу не хватает индекса.
+        """
+        with CaptureQueriesContext(connection) as context:
+            yield
+        problems = []
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for *_, detail in cursor.fetchall():
+                    if 'USE TEMP B-TREE' in detail or (
+                        detail.startswith('SCAN ') and 'INDEX' not in detail
+                    ):
+                        problems.append(f'{detail}: {sql}')
+        self.assertFalse(problems, '\n'.join(problems))
+
+    def test_notes_pages_use_indexes(self):
+        urls = (
+            reverse('notes:list'),
+            reverse('notes:detail', args=(self.note.slug,)),
+            reverse('notes:edit', args=(self.note.slug,)),
+            reverse('notes:delete', args=(self.note.slug,)),
+        )
+        for url in urls:
+            with self.subTest(url=url), self.assertNoFullScans():
+                self.client.get(url)
@@ -0,0 +1,35 @@
+from unittest import skipIf
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@skipIf(connection.vendor != 'sqlite', 'PRAGMA есть только у SQLite.')
+class TestSqlitePragmas(TestCase):
+    def setUp(self):
+        self.connection = connections.create_connection('default')
+        self.addCleanup(self.connection.close)
+
+    def test_new_connection_gets_pragma_profile(self):
+        with CaptureQueriesContext(self.connection) as context:
+            self.connection.ensure_connection()
+        self.assertEqual(len(context), 0)
+        pragmas = settings.SQLITE_PRAGMAS
+        self.assertEqual(
+            pragma(self.connection, 'busy_timeout'), pragmas['busy_timeout']
+        )
+        # NORMAL и MEMORY.
+        self.assertEqual(pragma(self.connection, 'synchronous'), 1)
+        self.assertEqual(pragma(self.connection, 'temp_store'), 2)
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234})
+    def test_pragma_profile_is_configurable(self):
+        self.assertEqual(pragma(self.connection, 'busy_timeout'), 1234)
@@ -0,0 +1,58 @@
+import importlib
+import os
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from yanote.templating import warm_templates
+
+PROD_SETTINGS = 'yanote.settings.prod'
+
+# Профиль prod читает секретный ключ из окружения.
+with mock.patch.dict(os.environ, DJANGO_SECRET_KEY='test-secret-key'):
+    prod_settings = importlib.import_module(PROD_SETTINGS)
+
+
+class TestTemplates(SimpleTestCase):
+    def test_project_templates_compile(self):
+        output = StringIO()
+        call_command('check_templates', stdout=output)
+        self.assertIn('Шаблоны в порядке', output.getvalue())
+
+    def test_broken_template_fails_check(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'broken.html').write_text(
+                '{% if %}', encoding='utf-8'
+            )
+            engine = settings.TEMPLATES[0]
+            templates = [{**engine, 'DIRS': [*engine['DIRS'], directory]}]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaisesMessage(CommandError, '1 из'):
+                    call_command('check_templates', stderr=StringIO())
+
+    @override_settings(TEMPLATES=prod_settings.TEMPLATES)
+    def test_warm_templates_fills_cached_loader(self):
+        warm_templates()
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('notes/list.html', loader.get_template_cache)
+        self.assertIn('base.html', loader.get_template_cache)
+
+
+class TestProdSettings(SimpleTestCase):
+    @mock.patch.dict(sys.modules)
+    @mock.patch.dict(os.environ)
+    def test_secret_key_is_required(self):
+        os.environ.pop('DJANGO_SECRET_KEY', None)
+        del sys.modules[PROD_SETTINGS]
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, 'DJANGO_SECRET_KEY'
+        ):
+            importlib.import_module(PROD_SETTINGS)
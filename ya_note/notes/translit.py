@@ -0,0 +1,27 @@
+"""Транслитерация заголовков заметок в slug."""
+from functools import lru_cache
+
+from django.conf import settings
+from pytils.translit import slugify
+
+
+@lru_cache(maxsize=settings.NOTES_SLUG_CACHE_SIZE)
+def slugify_title(title):
+    """
+    Slug из заголовка заметки.
+
+    Транслитерация заметно дороже поиска в словаре, а одни и те же
+    заголовки встречаются часто, поэтому результаты кешируются.
+    """
+    return slugify(title)
+
+
+def slug_cache_stats():
+    """Счётчики кеша транслитерации для мониторинга."""
+    info = slugify_title.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+    }
@@ -1,10 +1,29 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.urls import reverse_lazy
 from django.views import generic
 
+from yanote.offload import async_view
+
+from .export import FORMATS, export_response, note_rows
 from .forms import NoteForm
 from .models import Note
 
+# Наибольший id BigAutoField: больший SQLite не примет в запросе.
+MAX_ID = 2**63 - 1
+
+
+def parse_id(value):
+    """id из строки или None, если это не id записи."""
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= pk <= MAX_ID:
+        return None
+    return pk
+
 
 class Home(generic.TemplateView):
     """Домашняя страница."""
@@ -56,12 +75,60 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список всех заметок пользователя.
+
+    Заметки выводятся страницами по NOTES_PAGE_SIZE штук. Следующая
+    страница начинается после id, переданного в параметре after, поэтому
+    любая страница стоит столько же, сколько первая.
+    """
 
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        queryset = (
+            super().get_queryset().only('id', 'slug', 'title').order_by('id')
+        )
+        after = parse_id(self.request.GET.get('after'))
+        if after is not None:
+            queryset = queryset.filter(id__gt=after)
+        # Лишняя запись показывает, что есть следующая страница.
+        return queryset[: settings.NOTES_PAGE_SIZE + 1]
+
+    def get_context_data(self, **kwargs):
+        notes = list(self.object_list)
+        next_cursor = None
+        if len(notes) > settings.NOTES_PAGE_SIZE:
+            notes = notes[: settings.NOTES_PAGE_SIZE]
+            next_cursor = notes[-1].id
+        return super().get_context_data(
+            object_list=notes, next_cursor=next_cursor, **kwargs
+        )
+
+
+class NotesExport(LoginRequiredMixin, generic.View):
+    """
+    Выгрузка всех заметок пользователя в CSV или JSON Lines.
+
+    Файл не собирается в памяти целиком, см. export_response.
+    """
+
+    def get(self, request, file_format):
+        if file_format not in FORMATS:
+            raise Http404
+        return export_response(
+            request, file_format, 'notes', note_rows(request.user.pk)
+        )
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
 
     template_name = 'notes/detail.html'
+
+
+# Асинхронные варианты страниц чтения для ASGI, см. ASYNC_VIEWS. Заметки
+# видны только автору, поэтому без БД не обойтись: представления целиком
+# выполняются в пуле потоков.
+notes_list = async_view(NotesList.as_view())
+note_detail = async_view(NoteDetail.as_view())
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings.prod')
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+if settings.WARM_TEMPLATES:
+    from yanote.templating import warm_templates
+
+    warm_templates()
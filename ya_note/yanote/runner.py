@@ -0,0 +1,26 @@
+from django.db import connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .middleware import instrument
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """Тесты падают, если представление превысило бюджет запросов к БД."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.strict_budgets = override_settings(QUERY_BUDGET_STRICT=True)
+        self.strict_budgets.enable()
+
+    def setup_databases(self, **kwargs):
+        old_config = super().setup_databases(**kwargs)
+        # Соединения тестовых БД открыты до загрузки middleware, а под
+        # ASGI синхронные представления работают и с ними.
+        for connection in connections.all():
+            instrument(connection)
+        return old_config
+
+    def teardown_test_environment(self, **kwargs):
+        self.strict_budgets.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,8 @@
+"""
+Настройки YaNote по окружениям.
+
+base — общие настройки, dev — для разработки, test — для тестов,
+prod — для продакшена. Профиль выбирается через DJANGO_SETTINGS_MODULE,
+например yanote.settings.prod; сам пакет yanote.settings — это dev.
+"""
+from .dev import *  # noqa: F401,F403
@@ -0,0 +1,168 @@
+import os
+from pathlib import Path
+
+from django.urls import reverse_lazy
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = (
+    'django-insecure-yipnj$#j!ajarq%k55z4kuf3x79)91h0h42o9!1ho(z=!%mt=#'
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'notes.apps.NotesConfig',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'yanote.middleware.QueryBudgetMiddleware',
+]
+
+ROOT_URLCONF = 'yanote.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны при запуске WSGI/ASGI-приложения. Имеет
+# смысл только с кеширующим загрузчиком, см. профиль prod.
+WARM_TEMPLATES = False
+
+WSGI_APPLICATION = 'yanote.wsgi.application'
+
+# Асинхронные представления списка заметок и заметки; включает их
+# asgi.py. Работа с БД из них идёт в пуле из ASYNC_VIEW_THREADS потоков.
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS') == '1'
+ASYNC_VIEW_THREADS = int(os.getenv('DJANGO_ASYNC_VIEW_THREADS', '8'))
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# PRAGMA для каждого нового соединения с SQLite, выполняются по порядку.
+# busy_timeout (мс) — сколько ждать блокировку вместо немедленной ошибки
+# «database is locked»; он идёт первым, потому что переключение журнала
+# тоже берёт блокировку. В режиме WAL чтение не ждёт записи,
+# а synchronous=NORMAL в этом режиме безопасен и не делает fsync на
+# каждую транзакцию.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    # Отрицательное значение задаёт размер в КиБ, а не в страницах.
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_URL = reverse_lazy('users:login')
+LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_PAGE_SIZE = 50
+
+# Сколько строк читать из БД за раз при выгрузке заметок.
+EXPORT_CHUNK_SIZE = 2000
+# Под ASGI выгрузка собирается во временном файле: до этого размера
+# в памяти, дальше на диске.
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Сколько заголовков хранить в кеше транслитерации slug.
+NOTES_SLUG_CACHE_SIZE = 4096
+
+# Сколько запросов к БД может выполнить представление, вместе с загрузкой
+# сессии и пользователя. С QUERY_BUDGET_STRICT превышение вызывает ошибку,
+# иначе пишется предупреждение в лог yanote.queries.
+QUERY_BUDGETS = {
+    'notes:home': 2,
+    'notes:add': 8,
+    'notes:edit': 8,
+    'notes:detail': 3,
+    'notes:delete': 4,
+    'notes:list': 3,
+    'notes:success': 2,
+    # Под WSGI строки выгрузки читаются при отправке, уже после проверки
+    # бюджета, и не считаются; под ASGI файл собирается в представлении.
+    'notes:export': 3,
+}
+QUERY_BUDGET_STRICT = False
+
+# Тесты запускаются со строгой проверкой бюджетов.
+TEST_RUNNER = 'yanote.runner.QueryBudgetTestRunner'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yanote.queries': {
+            'handlers': ['console'],
+            'level': os.getenv('QUERY_LOG_LEVEL', 'WARNING'),
+        },
+        # Отчёт о прогреве шаблонов виден с TEMPLATE_LOG_LEVEL=INFO.
+        'yanote.templates': {
+            'handlers': ['console'],
+            'level': os.getenv('TEMPLATE_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
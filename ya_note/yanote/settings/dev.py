@@ -0,0 +1,6 @@
+"""Настройки для разработки."""
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+ALLOWED_HOSTS = ['*']
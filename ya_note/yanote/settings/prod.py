@@ -0,0 +1,99 @@
+"""
+Настройки для продакшена.
+
+Отладка выключена, секреты и параметры БД и кеша берутся из окружения.
+Соединения с БД переиспользуются, сессии читаются из кеша, ответы
+сжимаются, шаблоны компилируются один раз и прогреваются при запуске
+приложения.
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import (
+    BASE_DIR,
+    MIDDLEWARE,
+    SQLITE_PRAGMAS,
+    TEMPLATES,
+)
+
+DEBUG = False
+
+# Ключ из base.py лежит в репозитории, в продакшене он не годится.
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Не задан DJANGO_SECRET_KEY.')
+
+ALLOWED_HOSTS = os.getenv(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+# GZip должен стоять первым, чтобы сжимать уже готовый ответ.
+MIDDLEWARE = ['django.middleware.gzip.GZipMiddleware', *MIDDLEWARE]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        # Сколько секунд держать соединение открытым между запросами.
+        'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', '60')),
+    }
+}
+
+SQLITE_PRAGMAS = {
+    **SQLITE_PRAGMAS,
+    # Сколько секунд ждать блокировку записи.
+    'busy_timeout': int(os.getenv('DJANGO_DB_TIMEOUT', '20')) * 1000,
+    'mmap_size': int(os.getenv('DJANGO_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv('DJANGO_SQLITE_CACHE_SIZE', -64 * 1024)),
+}
+
+# Сессии должны быть общими для всех процессов: memcached, если задан
+# DJANGO_MEMCACHED_LOCATION, иначе кеш в файлах.
+MEMCACHED_LOCATION = os.getenv('DJANGO_MEMCACHED_LOCATION')
+
+if MEMCACHED_LOCATION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': MEMCACHED_LOCATION.split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv(
+                'NOTES_CACHE_DIR',
+                os.path.join(tempfile.gettempdir(), 'yanote-cache'),
+            ),
+        }
+    }
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        # С явным списком загрузчиков APP_DIRS должен быть выключен,
+        # шаблоны приложений подключает app_directories.Loader.
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'debug': False,
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    [
+                        'django.template.loaders.filesystem.Loader',
+                        'django.template.loaders.app_directories.Loader',
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+WARM_TEMPLATES = True
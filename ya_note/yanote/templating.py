@@ -0,0 +1,46 @@
+"""Компиляция и прогрев шаблонов проекта."""
+import logging
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+
+logger = logging.getLogger('yanote.templates')
+
+
+def template_names(engine):
+    """Имена всех шаблонов из каталогов DIRS движка."""
+    for directory in map(Path, engine.dirs):
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def compile_templates():
+    """
+    Загружает и компилирует каждый шаблон проекта.
+
+    С кеширующим загрузчиком скомпилированные шаблоны остаются в его
+    кеше. Возвращает число шаблонов и словарь ошибок по именам.
+    """
+    count = 0
+    errors = {}
+    for engine in engines.all():
+        for name in template_names(engine):
+            count += 1
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                errors[name] = error
+    return count, errors
+
+
+def warm_templates():
+    """
+    Прогревает кеш шаблонов при запуске приложения.
+
+    Ошибки только пишутся в лог: их ловит команда check_templates,
+    а запуск сервера из-за них не прерывается.
+    """
+    count, errors = compile_templates()
+    for name, error in errors.items():
+        logger.error('Шаблон %s не компилируется: %s', name, error)
+    logger.info('Прогрето шаблонов: %d', count - len(errors))